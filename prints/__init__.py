@@ -1,3 +1,6 @@
+from .api import build, export
+from .operations import pattern_cut
 from .params import ParamsBase, Result
+from .topology import topology
 
-__all__ = ["ParamsBase", "Result"]
+__all__ = ["ParamsBase", "Result", "build", "export", "pattern_cut", "topology"]
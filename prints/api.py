@@ -0,0 +1,144 @@
+"""
+Build and export models from Python, without going through the command line.
+
+Modules are validated, imported and checked once per process, and params are
+set directly rather than parsed, so these suit long-running services which
+build many variants.
+"""
+
+import functools
+from argparse import Namespace
+from collections.abc import Mapping
+from types import ModuleType
+from typing import Any
+
+from .deps import trace_params
+from .params import ParamsBase, Result
+from .utils import Primitive, flatten_overrides, flatten_params, override_args
+
+
+@functools.cache
+def _load_module(module_name: str) -> ModuleType:
+    # imported here, so that importing ``prints`` doesn't import the command line
+    from .cli import load_module
+
+    return load_module(module_name)
+
+
+def _set_override(params: ParamsBase, name: str, value: Primitive) -> None:
+    *path, key = name.split(".")
+    target = params
+    for part in path:
+        target = getattr(target, part, None)
+        if not isinstance(target, ParamsBase):
+            raise ValueError(f"unknown param ``{name}``")
+
+    cls = type(target)._annotations().get(key)
+    if cls is None or (isinstance(cls, type) and issubclass(cls, ParamsBase)):
+        raise ValueError(f"unknown param ``{name}``")
+    if cls is bool and not isinstance(value, bool):
+        raise ValueError(f"param ``{name}`` must be a bool")
+    # ``int`` would truncate a float, and accept a bool
+    if cls is int and (
+        isinstance(value, bool) or (isinstance(value, float) and not value.is_integer())
+    ):
+        raise ValueError(f"param ``{name}`` must be an int")
+    setattr(target, key, cls(value))
+
+
+def make_params(
+    module_name: str, overrides: Mapping[str, Any] | ParamsBase | None = None
+) -> ParamsBase:
+    """
+    Create and validate the params of a module, from overrides of its defaults
+    given as nested mappings, or by dotted names, as in a job's ``params``; or
+    as an instance of the module's ``Params``, which is used as is.
+    """
+    mod = _load_module(module_name)
+    if isinstance(overrides, ParamsBase):
+        if not isinstance(overrides, mod.Params):
+            raise ValueError(f"params must be an instance of {module_name}.Params")
+        params = overrides
+    else:
+        params = mod.Params.defaults()
+        for name, value in flatten_overrides(overrides or {}).items():
+            _set_override(params, name, value)
+
+    params.validate()
+    return trace_params(params)
+
+
+def build(
+    module_name: str,
+    overrides: Mapping[str, Any] | ParamsBase | None = None,
+    *,
+    only: list[str] | None = None,
+) -> list[Result]:
+    """
+    Build a model, returning its parts; only those named by ``only``, if given.
+    """
+    from .cli import iter_results
+
+    params = make_params(module_name, overrides)
+    results = []
+    remaining = set(only or [])
+    for r in iter_results(_load_module(module_name).main(params)):
+        if only and r.name not in only:
+            continue
+        results.append(r)
+
+        # stop generating once every named part is built
+        remaining.discard(r.name)
+        if only and not remaining:
+            break
+
+    return results
+
+
+def export(
+    module_name: str,
+    overrides: Mapping[str, Any] | ParamsBase | None = None,
+    *,
+    out: str = "./",
+    type: str = "3mf",
+    only: list[str] | None = None,
+    copies: list[str] | None = None,
+    force: bool = False,
+    mkdirp: bool = False,
+    thumbnail: bool = False,
+    check: str = "off",
+) -> list[str]:
+    """
+    Build a model and write its parts, as ``prints export`` does, returning the
+    paths written. File names are suffixed by the params which differ from the
+    module's defaults. With ``thumbnail``, a rendering of each part is embedded
+    in its 3mf. ``check`` is ``"warn"`` or ``"error"`` to check each part's mesh
+    as written, as ``prints export --check`` does.
+    """
+    from . import cli
+
+    mod = _load_module(module_name)
+    params = make_params(module_name, overrides)
+
+    defaults = flatten_params(mod.Params.defaults())
+    changed = {k: v for k, v in flatten_params(params).items() if defaults[k] != v}
+    fname_suffix = ""
+    if s := cli.serialize_params(override_args(changed)):
+        fname_suffix = f"-{s}"
+
+    args = Namespace(
+        out=out,
+        mkdirp=mkdirp,
+        force=force,
+        only=only,
+        type=type,
+        copies=copies,
+        step_timestamp=False,
+        preset=None,
+        params_file=None,
+        thumbnail=thumbnail,
+        check=check,
+    )
+    return cli.export(
+        module_name, mod, args=args, params=params, fname_suffix=fname_suffix
+    )
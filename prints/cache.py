@@ -0,0 +1,386 @@
+import ast
+import copy
+import functools
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from importlib.machinery import ModuleSpec
+from importlib.metadata import PackageNotFoundError, version
+from types import ModuleType
+from typing import Any
+
+from build123d import Compound, Shape, export_brep, import_brep
+
+from .params import ParamsBase
+from .utils import flatten_params, is_primitive
+
+# environment overrides for the on-disk cache location and its size cap, in
+# bytes; a size of ``0`` disables the on-disk cache
+CACHE_DIR_ENV = "PRINTS_CACHE_DIR"
+CACHE_SIZE_ENV = "PRINTS_CACHE_SIZE"
+DEFAULT_CACHE_SIZE = 512 * 1024 * 1024
+
+SHAPE_EXT = ".brep"
+SHAPES_DIR = "shapes"
+ARTIFACTS_DIR = "artifacts"
+DEPS_DIR = "deps"
+# the directories of the on-disk cache, which share its size cap
+CACHE_DIRS = (SHAPES_DIR, ARTIFACTS_DIR, DEPS_DIR)
+# installed distributions whose versions key cached parts
+DEPENDENCIES = ("prints-ng", "build123d", "bd_warehouse")
+
+# the top level package, whose modules are followed through imports
+_PACKAGE = __name__.partition(".")[0]
+# the module which exports parts, whose code determines the content of artifacts
+_EXPORTER = f"{_PACKAGE}.cli"
+
+
+def cache_dir() -> str:
+    if path := os.environ.get(CACHE_DIR_ENV):
+        return path
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "prints")
+
+
+def cache_size() -> int:
+    return int(os.environ.get(CACHE_SIZE_ENV, DEFAULT_CACHE_SIZE))
+
+
+def _key_value(value: Any) -> Any:
+    if isinstance(value, ParamsBase):
+        # ``__class__`` rather than ``type``, which is not the class of traced params
+        return {value.__class__.__qualname__: flatten_params(value)}
+    if value is None or is_primitive(value):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_key_value(v) for v in value]
+
+    raise TypeError(f"cannot cache on a value of type {type(value)}")
+
+
+@functools.cache
+def _source_digest(fn: Callable) -> str:
+    source = inspect.getsource(fn)
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def _version(distribution: str) -> str | None:
+    try:
+        return version(distribution)
+    except PackageNotFoundError:
+        return None
+
+
+def _find_spec(name: str) -> ModuleSpec | None:
+    try:
+        return importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+
+
+@functools.cache
+def _imports(name: str) -> frozenset[str]:
+    # the package's modules imported when module ``name`` is; imports within
+    # functions run later, if at all, and aren't followed
+    spec = _find_spec(name)
+    if spec is None or not spec.has_location or not spec.origin:
+        return frozenset()
+    with open(spec.origin, "rb") as f:
+        tree = ast.parse(f.read())
+    # relative imports resolve against the package of a module, or a package
+    package = name
+    if spec.submodule_search_locations is None:
+        package = name.rpartition(".")[0]
+
+    found: set[str] = set()
+
+    def visit(node: ast.AST) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+                continue
+            if isinstance(child, ast.Import):
+                found.update(alias.name for alias in child.names)
+            elif isinstance(child, ast.ImportFrom):
+                base = child.module or ""
+                if child.level:
+                    base = importlib.util.resolve_name(
+                        "." * child.level + base, package
+                    )
+                # names imported from a package may be its modules
+                found.add(base)
+                found.update(f"{base}.{alias.name}" for alias in child.names)
+            visit(child)
+
+    visit(tree)
+    return frozenset(
+        n
+        for n in found
+        if n.partition(".")[0] == _PACKAGE and _find_spec(n) is not None
+    )
+
+
+def imported_modules(name: str) -> set[str]:
+    """
+    Module ``name``, and every module of this package it imports, directly or
+    not.
+    """
+    modules: set[str] = set()
+    pending = [name]
+    while pending:
+        if (module := pending.pop()) not in modules:
+            modules.add(module)
+            pending.extend(_imports(module))
+    return modules
+
+
+@functools.cache
+def module_digest(name: str) -> str:
+    """
+    Digest the source of module ``name`` and of every module of this package it
+    imports, along with the installed versions of ``DEPENDENCIES``; anything a
+    part built by the module may depend on.
+    """
+    digest = hashlib.sha256()
+    for module in sorted(imported_modules(name)):
+        spec = _find_spec(module)
+        if spec is None or not spec.has_location or not spec.origin:
+            continue
+        digest.update(module.encode())
+        with open(spec.origin, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    versions = {d: _version(d) for d in DEPENDENCIES}
+    digest.update(json.dumps(versions, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def cache_key(fn: Callable, *args: Any, **kwargs: Any) -> str:
+    """
+    Key a call to ``fn`` by its name, its source, the installed build123d version
+    and its arguments; arguments must be primitives, tuples of primitives, or
+    ``ParamsBase`` instances.
+    """
+    key = {
+        "fn": f"{fn.__module__}.{fn.__qualname__}",
+        "source": _source_digest(fn),
+        "build123d": version("build123d"),
+        "args": [_key_value(a) for a in args],
+        "kwargs": {k: _key_value(v) for k, v in kwargs.items()},
+    }
+    encoded = json.dumps(key, sort_keys=True)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _shape_path(key: str) -> str:
+    return os.path.join(cache_dir(), SHAPES_DIR, f"{key}{SHAPE_EXT}")
+
+
+def evict(directories: Iterable[str], max_size: int) -> None:
+    """
+    Remove the least recently used files across ``directories`` until their
+    contents together fit within ``max_size`` bytes. Reads touch a file's mtime,
+    so mtime order is use order. Files still being written, which end in
+    ``.tmp``, are left alone.
+    """
+    entries = []
+    for directory in directories:
+        try:
+            scanned = list(os.scandir(directory))
+        except FileNotFoundError:
+            continue
+        for entry in scanned:
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # another process evicted it first
+            pass
+        total -= size
+
+
+def evict_cache(max_size: int) -> None:
+    """
+    Evict from every directory of the on-disk cache, against one ``max_size``.
+    """
+    evict([os.path.join(cache_dir(), d) for d in CACHE_DIRS], max_size)
+
+
+def read_shape(key: str, cls: type[Shape] | None = None) -> Shape | None:
+    if not cache_size():
+        return None
+
+    path = _shape_path(key)
+    try:
+        shape = import_brep(path)
+        os.utime(path)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if cls is not None and issubclass(cls, Compound) and isinstance(shape, Compound):
+        shape = cls(shape.wrapped)
+
+    return shape
+
+
+def write_shape(key: str, shape: Shape) -> None:
+    max_size = cache_size()
+    if not max_size:
+        return
+
+    path = _shape_path(key)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    # write beside the final path then rename, so concurrent readers never see
+    # a partially written file
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        export_brep(shape, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    evict_cache(max_size)
+
+
+def artifact_key(mod: ModuleType, **options: Any) -> str:
+    """
+    Key the exports of a module by its name, its source and that of every module
+    of this package it imports, the export code, the installed versions of
+    ``DEPENDENCIES`` and the export ``options``, which must be serializable as
+    JSON.
+    """
+    module = inspect.getmodule(mod)
+    key = {
+        "module": mod.__name__,
+        "source": hashlib.sha256(inspect.getsource(mod).encode()).hexdigest(),
+        "imports": module_digest(module.__name__) if module else None,
+        "exporter": module_digest(_EXPORTER),
+        "options": options,
+    }
+    encoded = json.dumps(key, sort_keys=True)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _artifacts_index_path(key: str) -> str:
+    return os.path.join(cache_dir(), ARTIFACTS_DIR, f"{key}.json")
+
+
+def read_artifacts(key: str) -> list[tuple[str, str]] | None:
+    """
+    The cached exports under ``key``, as the name given to each with
+    ``write_artifacts`` and the path of its cached file; ``None`` if any are
+    missing.
+    """
+    if not cache_size():
+        return None
+
+    index_path = _artifacts_index_path(key)
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+        directory = os.path.dirname(index_path)
+        artifacts = [(name, os.path.join(directory, file)) for name, file in index]
+        for path in [index_path, *(path for _, path in artifacts)]:
+            os.utime(path)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    return artifacts
+
+
+def write_artifacts(key: str, artifacts: list[tuple[str, str]]) -> None:
+    """
+    Copy exported files into the cache under ``key``, each given as a name and
+    the path of the file.
+    """
+    max_size = cache_size()
+    if not max_size:
+        return
+
+    index_path = _artifacts_index_path(key)
+    directory = os.path.dirname(index_path)
+    os.makedirs(directory, exist_ok=True)
+
+    index = []
+    for idx, (name, path) in enumerate(artifacts):
+        file = f"{key}-{idx}{os.path.splitext(path)[1]}"
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+        shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, os.path.join(directory, file))
+        index.append((name, file))
+
+    # the index is written last, so that it's only read once its files exist
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path)
+
+    evict_cache(max_size)
+
+
+def cached_shape(fn: Callable | None = None, *, maxsize: int = 32):
+    """
+    Memoize a shape builder in memory and on disk, keyed by its arguments.
+
+    Builders of shapes that are expensive and rarely change (threads, shared
+    blanks) can be wrapped to skip rebuilding them on every run. Results are
+    kept in an in-memory LRU of ``maxsize`` entries, and written as BREP to the
+    on-disk cache, which is capped to ``PRINTS_CACHE_SIZE`` bytes.
+
+    Callers receive a deep copy of the cached shape, which shares no sub-shapes
+    with it: moving or meshing it leaves the cached one untouched.
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        memory: OrderedDict[str, Shape] = OrderedDict()
+        return_cls = inspect.signature(fn).return_annotation
+        if not (inspect.isclass(return_cls) and issubclass(return_cls, Shape)):
+            return_cls = None
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = cache_key(fn, *args, **kwargs)
+
+            if key in memory:
+                memory.move_to_end(key)
+                return copy.deepcopy(memory[key])
+
+            shape = read_shape(key, return_cls)
+            if shape is None:
+                shape = fn(*args, **kwargs)
+                write_shape(key, shape)
+
+            memory[key] = shape
+            if len(memory) > maxsize:
+                memory.popitem(last=False)
+
+            return copy.deepcopy(shape)
+
+        return wrapper
+
+    if fn is not None:
+        return decorator(fn)
+
+    return decorator
@@ -1,22 +1,68 @@
 #!/usr/bin/env python3
 import datetime
+import functools
+import itertools
+import json
+import multiprocessing
 import os
+import re
+import shutil
 import sys
+import uuid
 from argparse import (
     Action,
     ArgumentParser,
     BooleanOptionalAction,
     Namespace,
 )
-from collections.abc import Sequence
+from collections.abc import Callable, Generator, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict
 from importlib import import_module
+from multiprocessing.connection import Connection
 from types import ModuleType
 from typing import Any, override
 
-from build123d import Mesher, Shape, export_step, export_stl, pack
+from build123d import Mesher, Pos, Rot, Shape, export_step, export_stl, pack
+from OCP.BRepTools import BRepTools
 
+from .cache import artifact_key, read_artifacts, write_artifacts
+from .deps import trace_params, untrace_params
+from .estimate import DEFAULT_DENSITY, DEFAULT_DIAMETER
+from .fit import DEFAULT_RESOLUTION
+from .gltf import GLB_ANGULAR_TOLERANCE, GLB_TOLERANCE, write_glb
+from .mesh import (
+    MESH_ANGULAR_TOLERANCE,
+    MESH_TOLERANCE,
+    Mesh,
+    check_mesh,
+    read_3mf,
+    read_stl,
+    shape_mesh,
+)
 from .params import ParamsBase, Result
-from .utils import check_module, flatten_params
+from .presets import params_file_args, preset_args
+from .thumbnail import (
+    THUMBNAIL_ANGULAR_TOLERANCE,
+    THUMBNAIL_SIZE,
+    THUMBNAIL_TOLERANCE,
+    thumbnail,
+)
+from .utils import check_module, file_digest, flatten_params
+
+EXPORT_TYPES = ("3mf", "step", "stl", "glb")
+# what export does with parts whose meshes would trouble a slicer
+CHECK_MODES = ("off", "warn", "error")
+
+# tessellation used by ``view --preview``; ocp_vscode defaults to 0.1 and 0.2
+PREVIEW_DEVIATION = 1.0
+PREVIEW_ANGULAR_TOLERANCE = 1.0
+# distance between copies of a part in an exported 3mf, in mm
+COPY_SPACING = 5
+# written in place of the time in STEP headers, unless --step-timestamp is given
+STEP_TIMESTAMP = "1970-01-01T00:00:00"
+# namespace of the UUIDs given to 3mf objects
+UUID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/fardog/prints-ng")
 
 
 class PrefixedAction(Action):
@@ -159,6 +205,276 @@ def validate_mod_name(mod_name: str) -> None:
         raise ValueError("invalid module name; invalid import")
 
 
+def load_module(mod_name: str) -> ModuleType:
+    validate_mod_name(mod_name)
+    mod = import_module(f".models.{mod_name}", "prints")
+    check_module(mod)
+    return mod
+
+
+def parse_params(
+    mod: ModuleType,
+    raw_params: list[str],
+    *,
+    preset: str | None = None,
+    params_file: str | None = None,
+) -> tuple[ParamsBase, str]:
+    """
+    Parse and validate the module's ``Params`` from command line style
+    overrides, returning them along with the file name suffix which serializes
+    the overrides.
+
+    The overrides of a ``preset``, or of a ``params_file``, are applied first,
+    so that ``raw_params`` may override them in turn; the suffix names the
+    preset or file, rather than serializing its overrides.
+    """
+    base_params, base_name = [], ""
+    if preset:
+        base_params, base_name = preset_args(mod, preset), preset
+    elif params_file:
+        base_params = params_file_args(params_file)
+        base_name = os.path.splitext(os.path.basename(params_file))[0]
+
+    param_parser = create_param_parser(mod.Params, description=mod.__doc__)
+    params = mod.Params.defaults()
+    param_parser.parse_args([*base_params, *raw_params], namespace=params)
+    params.validate()
+
+    fname_suffix = ""
+    if s := "&".join(filter(None, [base_name, serialize_params(raw_params)])):
+        fname_suffix = f"-{s}"
+
+    return trace_params(params), fname_suffix
+
+
+def _set_uuids(mesher: Mesher, seed: str) -> None:
+    """
+    Replace the random UUIDs given to each object, component and build item in
+    a 3mf with ones derived from ``seed``, so that identical models are written
+    identically.
+    """
+    uuids = (uuid.uuid5(UUID_NAMESPACE, f"{seed}/{idx}") for idx in itertools.count())
+    mesher.model.SetBuildUUID(str(next(uuids)))
+    objects = mesher.model.GetObjects()
+    while objects.MoveNext():
+        obj = objects.GetCurrentObject()
+        obj.SetUUID(str(next(uuids)))
+        if obj.IsComponentsObject():
+            for idx in range(obj.GetComponentCount()):
+                obj.GetComponent(idx).SetUUID(str(next(uuids)))
+    items = mesher.model.GetBuildItems()
+    while items.MoveNext():
+        items.GetCurrent().SetUUID(str(next(uuids)))
+
+
+def _reset_step_timestamp(path: str) -> None:
+    with open(path, "rb") as f:
+        content = f.read()
+    content = re.sub(
+        rb"(FILE_NAME\('(?:[^']|'')*',)'[^']*'",
+        rb"\1'" + STEP_TIMESTAMP.encode() + rb"'",
+        content,
+        count=1,
+    )
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+def _export_3mf(
+    part: Shape,
+    file_path: str,
+    *,
+    seed: dict[str, Any],
+    count: int,
+    with_thumbnail: bool,
+) -> None:
+    # remove any existing triangulation, so the settings below always apply
+    BRepTools.Clean_s(part.wrapped)
+    mesher = Mesher()
+    mesher.add_shape(
+        part,
+        linear_deflection=MESH_TOLERANCE,
+        angular_deflection=MESH_ANGULAR_TOLERANCE,
+    )
+    # further copies are placed in a row along X, each an instance of the
+    # meshes already added rather than a copy of them
+    step = part.bounding_box().size.X + COPY_SPACING
+    meshes = list(mesher.meshes)
+    for idx in range(1, count):
+        transform = mesher.wrapper.GetTranslationTransform(step * idx, 0, 0)
+        for mesh in meshes:
+            mesher.model.AddBuildItem(mesh, transform)
+    for k, v in sorted(seed["params"].items()):
+        mesher.add_meta_data(
+            name_space="custom",
+            name=k,
+            value=str(v),
+            metadata_type="str",
+            must_preserve=False,
+        )
+    if with_thumbnail:
+        # once the part's meshes are added, as this replaces its triangulation
+        mesh = shape_mesh(part, THUMBNAIL_TOLERANCE, THUMBNAIL_ANGULAR_TOLERANCE)
+        attachment = mesher.model.CreatePackageThumbnailAttachment()
+        attachment.ReadFromBuffer(thumbnail(mesh))
+    _set_uuids(mesher, json.dumps({**seed, "copies": count}, sort_keys=True))
+    mesher.write(file_path)
+
+
+def _export_step(part: Shape, file_path: str, *, timestamp: bool) -> None:
+    export_step(part, file_path)
+    if not timestamp:
+        _reset_step_timestamp(file_path)
+
+
+def _export_stl(part: Shape, file_path: str) -> None:
+    BRepTools.Clean_s(part.wrapped)
+    export_stl(
+        part,
+        file_path,
+        tolerance=MESH_TOLERANCE,
+        angular_tolerance=MESH_ANGULAR_TOLERANCE,
+    )
+
+
+def _problems(meshes: list[Mesh]) -> list[str]:
+    if not meshes:
+        return ["no triangles"]
+    # each problem once, though copies of a part repeat its problems
+    return list(dict.fromkeys(p for m in meshes for p in check_mesh(m)))
+
+
+def _write_part(
+    export_fn: Callable[[Shape, str], None], part: Shape, check: bool, file_path: str
+) -> list[str]:
+    """
+    Export ``part`` to ``file_path``, returning the problems of its meshes as
+    written if ``check``.
+    """
+    export_fn(part, file_path)
+    if not check:
+        return []
+    if file_path.endswith(".3mf"):
+        meshes, _ = read_3mf(file_path)
+    elif file_path.endswith(".stl"):
+        meshes = [read_stl(file_path)]
+    else:
+        # STEP holds no mesh; check the one 3mf and stl exports would write
+        meshes = [shape_mesh(part)]
+    return _problems(meshes)
+
+
+def _glb_mesh(part: Shape, check: bool) -> tuple[Mesh, list[str]]:
+    """
+    Mesh ``part`` for glb, along with the problems of the mesh if ``check``.
+    """
+    mesh = shape_mesh(part, GLB_TOLERANCE, GLB_ANGULAR_TOLERANCE)
+    return mesh, _problems([mesh]) if check else []
+
+
+def _forked(sender: Connection, fn: Callable[..., Any], *args: Any) -> None:
+    try:
+        outcome = (True, fn(*args))
+    except Exception as e:
+        outcome = (False, e)
+    try:
+        sender.send(outcome)
+    except Exception:
+        # an exception which can't be pickled, as OCC's can't be, is described
+        sender.send((False, RuntimeError(f"{type(outcome[1]).__name__}: {outcome[1]}")))
+
+
+def _fork(fn: Callable[..., Any], *args: Any) -> Callable[[], Any]:
+    """
+    Call ``fn`` in a process forked from this one, which has its own copy of
+    every shape, returning a function which waits for its result, or raises its
+    exception. Where processes can't be forked, ``fn`` is called here, at once.
+
+    Tessellation holds the GIL, so on a thread it would stall this one; and it
+    replaces the triangulation of shapes, which may be shared with others.
+    """
+    if "fork" not in multiprocessing.get_all_start_methods():
+        try:
+            value = fn(*args)
+        except Exception as e:
+            error = e
+
+            def fail() -> Any:
+                raise error
+
+            return fail
+        return lambda: value
+
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_forked, args=(sender, fn, *args), daemon=True)
+    process.start()
+    sender.close()
+
+    def result() -> Any:
+        try:
+            ok, value = receiver.recv()
+        except EOFError:
+            process.join()
+            raise ChildProcessError(
+                f"export process exited with code {process.exitcode}"
+            ) from None
+        finally:
+            receiver.close()
+        process.join()
+        if not ok:
+            raise value
+        return value
+
+    return result
+
+
+def parse_copies(values: list[str]) -> dict[str | None, int]:
+    """
+    Parse ``--copies`` values, each either ``name=count`` for the part with
+    that name, or a bare ``count`` for every part, into counts by part name.
+    """
+    copies: dict[str | None, int] = {}
+    for value in values:
+        name, _, count = value.rpartition("=")
+        try:
+            copies[name or None] = int(count)
+        except ValueError:
+            raise ValueError(f"invalid --copies value: {value}") from None
+        if copies[name or None] < 1:
+            raise ValueError(f"invalid --copies value: {value}")
+    return copies
+
+
+def iter_results(res: Any) -> Iterator[Result]:
+    """
+    Iterate the results of a module's ``main``, which may return a ``Result``,
+    a list or tuple of them, or yield them one at a time; a generator is only
+    advanced as results are consumed, and is closed when iteration stops.
+    """
+    if isinstance(res, Result):
+        yield res
+        return
+    if not isinstance(res, (list, tuple, Iterator)):
+        raise ValueError(
+            f"invalid generation: received unexpected type {type(res)} from module"
+        )
+
+    empty = True
+    try:
+        for r in res:
+            if not isinstance(r, Result):
+                raise ValueError("invalid generation: was not instance of ``Result``")
+            empty = False
+            yield r
+    finally:
+        if isinstance(res, Generator):
+            res.close()
+
+    if empty:
+        raise ValueError("invalid generation: received empty list of results")
+
+
 def export(
     mod_name: str,
     mod: ModuleType,
@@ -166,7 +482,7 @@ def export(
     args: Namespace,
     params: ParamsBase,
     fname_suffix: str = "",
-) -> None:
+) -> list[str]:
     fname = args.out
 
     if args.mkdirp:
@@ -176,63 +492,279 @@ def export(
     if os.path.isdir(fname):
         fname = os.path.join(fname, mod_name)
 
-    export_fn = None
-    ext = None
-    if args.type == "3mf":
+    copies = parse_copies(args.copies or [])
+    if copies and args.type != "3mf":
+        raise ValueError("--copies is only supported when exporting 3mf")
+    if args.thumbnail and args.type != "3mf":
+        raise ValueError("--thumbnail is only supported when exporting 3mf")
 
-        def export_3mf(
-            to_export: Shape,
-            file_path: os.PathLike | str | bytes,
-        ) -> bool:
-            mesher = Mesher()
-            mesher.add_shape(to_export)
-            for k, v in flatten_params(params).items():
-                mesher.add_meta_data(
-                    name_space="custom",
-                    name=k,
-                    value=str(v),
-                    metadata_type="str",
-                    must_preserve=False,
-                )
-            mesher.write(file_path)
-            return True
+    flat_params = flatten_params(params)
+    seed = {"module": mod_name, "params": flat_params}
+    checking = args.check != "off"
+
+    def part_export(result: Result) -> Callable[[Shape, str], None]:
+        if args.type == "3mf":
+            return functools.partial(
+                _export_3mf,
+                seed={**seed, "name": result.name},
+                count=copies.get(result.name or "", copies.get(None, 1)),
+                with_thumbnail=args.thumbnail,
+            )
+        if args.type == "step":
+            return functools.partial(_export_step, timestamp=args.step_timestamp)
+        return _export_stl
+
+    def check(name: str, problems: list[str]) -> None:
+        if not problems:
+            return
+        message = f"{name}: {'; '.join(problems)}"
+        if args.check == "error":
+            raise ValueError(message)
+        print(f"[{datetime.datetime.now()}] warning: {message}", file=sys.stderr)
+
+    def written(name: str, exported: Callable[[], list[str]]) -> None:
+        check(name, exported())
+
+    def glb_mesh(name: str, exported: Callable[[], tuple[Mesh, list[str]]]) -> Mesh:
+        mesh, problems = exported()
+        check(name, problems)
+        return mesh
 
-        export_fn = export_3mf
+    def export_glb(file_path: str) -> None:
+        write_glb(
+            file_path,
+            [(name, mesh.result()) for name, mesh in meshes],
+            extras={"module": mod_name, "params": flat_params},
+        )
+
+    ext = None
+    if args.type == "3mf":
         ext = ".3mf"
     elif args.type == "step":
-        export_fn = export_step
         ext = ".step"
     elif args.type == "stl":
-        export_fn = export_stl
         ext = ".stl"
+    elif args.type == "glb":
+        # every part is written to one file, once all are meshed
+        ext = ".glb"
     else:
         raise ValueError(f"unsupported extension: {ext}")
 
-    def output(result: Result, final_path: str) -> None:
-        if os.path.exists(final_path) and not args.force:
-            raise FileExistsError(f"{final_path} exists; use --force to overwrite")
-        export_fn(result.part, final_path)
-        print(f"[{datetime.datetime.now()}] generated: {final_path}")
+    # exports of presets and params files are cached whole, keyed by everything
+    # which determines their content; checks run on exports as they're made, so
+    # they skip the cache
+    key = None
+    if (
+        (args.preset or args.params_file)
+        and not args.step_timestamp
+        and args.check == "off"
+    ):
+        key = artifact_key(
+            mod,
+            params=flat_params,
+            type=args.type,
+            only=sorted(args.only or []),
+            copies=sorted(args.copies or []),
+            thumbnail=args.thumbnail,
+        )
 
-    res = mod.main(params)
-    if not res:
-        raise ValueError("invalid generation: received empty list of results")
-    elif isinstance(res, (list, tuple)):
-        for idx, r in enumerate(res):
-            if args.only and r.name not in args.only:
-                continue
-            if not isinstance(r, Result):
-                raise ValueError("invalid generation: was not instance of ``Result``")
-            name = r.name if r.name else str(idx)
-            part_outfile = f"{fname}-{name}{fname_suffix}{ext}"
-            output(r, part_outfile)
-    elif isinstance(res, Result):
-        part_outfile = f"{fname}{fname_suffix}{ext}"
-        output(res, part_outfile)
-    else:
-        raise ValueError(
-            f"invalid generation: received unexpected type {type(res)} from module"
+    outputs: list[str] = []
+    # the part name of each output's file name, for the cache
+    output_names: list[str] = []
+    # each output's write, in order
+    writes: list[Future] = []
+    # for glb, each part's name and mesh
+    meshes: list[tuple[str, Future]] = []
+
+    def temp_path(final_path: str) -> str:
+        # exports are written beside their destination first, so that an
+        # existing file with identical content can be left untouched, mtime
+        # included
+        dir, base = os.path.split(final_path)
+        return os.path.join(dir, f".{base}.{uuid.uuid4().hex[:8]}{ext}")
+
+    def output(
+        final_path: str,
+        tmp_path: str,
+        write: Callable[[], None],
+        action: str = "generated",
+    ) -> None:
+        try:
+            write()
+            if os.path.exists(final_path):
+                if file_digest(tmp_path) == file_digest(final_path):
+                    print(f"[{datetime.datetime.now()}] unchanged: {final_path}")
+                    return
+                if not args.force:
+                    raise FileExistsError(
+                        f"{final_path} exists; use --force to overwrite"
+                    )
+            os.replace(tmp_path, final_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        print(f"[{datetime.datetime.now()}] {action}: {final_path}")
+
+    artifacts = read_artifacts(key) if key else None
+    # each output's settling, once its part is exported
+    waiting: list[Callable[[], None]] = []
+
+    def settle(future: Future, fn: Callable, *args: Any) -> None:
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+
+    def finish() -> None:
+        for fn in waiting:
+            fn()
+        waiting.clear()
+
+    def submit(
+        name: str,
+        final_path: str,
+        tmp_path: str,
+        write: Callable[[], None],
+        action: str = "generated",
+    ) -> None:
+        outputs.append(final_path)
+        output_names.append(name)
+        writes.append(future := Future())
+        waiting.append(
+            functools.partial(
+                settle, future, output, final_path, tmp_path, write, action
+            )
+        )
+
+    def submit_part(result: Result, name: str, infix: str) -> None:
+        # each part is exported in a forked process while the next is built;
+        # the last is written first, so that parts aren't held in memory when
+        # building outpaces exporting
+        finish()
+        if args.type == "glb":
+            exported = _fork(_glb_mesh, result.part, checking)
+            meshes.append((name, future := Future()))
+            waiting.append(functools.partial(settle, future, glb_mesh, name, exported))
+            return
+
+        final_path = f"{fname}{infix}{fname_suffix}{ext}"
+        tmp_path = temp_path(final_path)
+        exported = _fork(
+            _write_part, part_export(result), result.part, checking, tmp_path
         )
+        submit(infix, final_path, tmp_path, functools.partial(written, name, exported))
+
+    try:
+        if artifacts is not None:
+            for name, path in artifacts:
+                final_path = f"{fname}{name}{fname_suffix}{ext}"
+                tmp_path = temp_path(final_path)
+                submit(
+                    name,
+                    final_path,
+                    tmp_path,
+                    functools.partial(shutil.copyfile, path, tmp_path),
+                    "cached",
+                )
+        elif isinstance(res := mod.main(params), Result):
+            submit_part(res, res.name or mod_name, "")
+        else:
+            # each part is queued as it's generated, and its locals released,
+            # so a module yielding its parts holds few at a time; with --only,
+            # generation stops once every named part is queued
+            remaining = set(args.only or [])
+            for idx, r in enumerate(iter_results(res)):
+                if args.only and r.name not in args.only:
+                    continue
+                name = r.name if r.name else str(idx)
+                submit_part(r, name, f"-{name}")
+                r.locals = None
+
+                remaining.discard(r.name)
+                if args.only and not remaining:
+                    break
+
+        finish()
+        if meshes:
+            final_path = f"{fname}{fname_suffix}{ext}"
+            tmp_path = temp_path(final_path)
+            submit("", final_path, tmp_path, functools.partial(export_glb, tmp_path))
+    finally:
+        finish()
+        # every part's error is reported, rather than only the first
+        failed = [(p, w.exception()) for p, w in zip(outputs, writes) if w.exception()]
+        for final_path, e in failed:
+            print(
+                f"[{datetime.datetime.now()}] failed: {final_path}: {e}",
+                file=sys.stderr,
+            )
+
+    if failed:
+        raise failed[0][1]
+
+    if key and artifacts is None:
+        write_artifacts(key, list(zip(output_names, outputs)))
+
+    return outputs
+
+
+def thumbnails(
+    mod_name: str,
+    mod: ModuleType,
+    *,
+    args: Namespace,
+    params: ParamsBase,
+    fname_suffix: str = "",
+) -> list[str]:
+    fname = args.out
+
+    if args.mkdirp:
+        dir = os.path.dirname(fname)
+        os.makedirs(dir, exist_ok=True)
+
+    if os.path.isdir(fname):
+        fname = os.path.join(fname, mod_name)
+
+    # parts are meshed here, as they're generated, and rendered in other
+    # processes; with one worker, on a thread, while the next part is built
+    workers = args.workers or os.cpu_count() or 1
+    if workers == 1:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnail")
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+
+    outputs: list[str] = []
+    renders: list[Future] = []
+
+    def submit(result: Result, infix: str) -> None:
+        path = f"{fname}{infix}{fname_suffix}.png"
+        if os.path.exists(path) and not args.force:
+            raise FileExistsError(f"{path} exists; use --force to overwrite")
+        mesh = result.mesh(THUMBNAIL_TOLERANCE, THUMBNAIL_ANGULAR_TOLERANCE)
+        outputs.append(path)
+        renders.append(executor.submit(thumbnail, mesh, args.size))
+
+    with executor:
+        if isinstance(res := mod.main(params), Result):
+            submit(res, "")
+        else:
+            remaining = set(args.only or [])
+            for idx, r in enumerate(iter_results(res)):
+                if args.only and r.name not in args.only:
+                    continue
+                submit(r, f"-{r.name if r.name else idx}")
+                r.locals = None
+
+                remaining.discard(r.name)
+                if args.only and not remaining:
+                    break
+
+        for path, render in zip(outputs, renders):
+            with open(path, "wb") as f:
+                f.write(render.result())
+            print(f"[{datetime.datetime.now()}] generated: {path}")
+
+    return outputs
 
 
 def view(
@@ -245,27 +777,202 @@ def view(
 ) -> None:
     from ocp_vscode import show
 
-    res = mod.main(params)
-    if not isinstance(res, (list, tuple)):
-        res = [res]
+    # previews show the final parts only, unless locals are explicitly requested
+    show_locals = args.locals if args.locals is not None else not args.preview
+    if show_locals:
+        # parts served from the cache have no locals
+        params = untrace_params(params)
+
+    res = list(iter_results(mod.main(params)))
+
+    objs, names = [], []
+    for idx, r in enumerate(res):
+        if args.only and len(res) > 1 and r.name not in args.only:
+            continue
+        objs.append(r.locals if show_locals and r.locals else r.part)
+        names.append(r.name if r.name else idx)
+
+    if not objs:
+        raise ValueError("no parts matched the names given to --only")
+
+    kwargs = {}
+    if args.preview:
+        kwargs["deviation"] = PREVIEW_DEVIATION
+        kwargs["angular_tolerance"] = PREVIEW_ANGULAR_TOLERANCE
+
+    show(*objs, names=names, **kwargs)
+
+
+def estimate(
+    mod_name: str,
+    mod: ModuleType,
+    *,
+    args: Namespace,
+    params: ParamsBase,
+    fname_suffix=None,  # not used by estimate method, but included for parity with export
+) -> None:
+    from . import estimate
+
+    res = list(iter_results(mod.main(params)))
+
+    estimates = []
+    for idx, r in enumerate(res):
+        if args.only and len(res) > 1 and r.name not in args.only:
+            continue
+        estimates.append(
+            estimate.estimate(
+                r.name or (mod_name if len(res) == 1 else str(idx)),
+                r.part,
+                density=args.density,
+                diameter=args.diameter,
+                time=args.time,
+            )
+        )
+
+    if not estimates:
+        raise ValueError("no parts matched the names given to --only")
+
+    if args.json:
+        print(json.dumps([asdict(e) for e in estimates]))
+        return
+
+    for e in estimates:
+        line = (
+            f"{e.name:<24}  {e.volume / 1000:9.2f} cm³  {e.length / 1000:8.2f} m  "
+            f"{e.mass:8.2f} g"
+        )
+        if e.time is not None:
+            line += f"  {datetime.timedelta(seconds=round(e.time))}"
+        print(line)
+
+
+def fit(
+    mod_name: str,
+    mod: ModuleType,
+    *,
+    args: Namespace,
+    params: ParamsBase,
+    fname_suffix=None,  # not used by fit method, but included for parity with export
+) -> None:
+    from . import fit
 
-    if not all([isinstance(r, Result) for r in res]):
-        raise ValueError("invalid generation: not instance of ``Result``")
+    res = list(iter_results(mod.main(params)))
+
+    parts = {r.name: r.part for r in res if r.name}
+    for name in args.parts:
+        if name not in parts:
+            raise ValueError(
+                f"no part named {name!r}; parts are {', '.join(parts) or 'unnamed'}"
+            )
+    a = parts[args.parts[0]]
+    # the second part is rotated about the origin, then moved
+    b = parts[args.parts[1]].moved(Pos(*args.move) * Rot(*args.rotate))
+
+    f = fit.fit(a, b, resolution=args.resolution, exact=args.exact)
+
+    if args.json:
+        print(json.dumps(asdict(f)))
+    elif f.interference:
+        print(f"interference: {-f.clearance:.3f} mm")
+    else:
+        print(f"clearance: {f.clearance:.3f} mm")
+    if not args.json and f.exact_clearance is not None:
+        print(f"exact clearance: {f.exact_clearance:.3f} mm")
+        if f.interference_volume:
+            print(f"interference volume: {f.interference_volume:.3f} mm³")
+
+    if f.interference:
+        sys.exit(1)
+
+
+def inspect(args: Namespace) -> None:
+    from .mesh import MeshStats, mesh_stats
+
+    def describe(s: MeshStats) -> None:
+        if args.json:
+            print(json.dumps(asdict(s)))
+            return
+        size = " x ".join(f"{hi - lo:.2f}" for lo, hi in zip(s.bbox[:3], s.bbox[3:]))
+        watertight = "watertight" if s.watertight else "NOT watertight"
+        print(
+            f"{s.path}  {s.triangles} triangles  {size} mm  "
+            f"{s.volume / 1000:.2f} cm³  {watertight}  {len(s.metadata)} params"
+        )
 
-    show(
-        *[r.locals if r.locals else r.part for r in res],
-        names=[r.name if r.name else idx for idx, r in enumerate(res)],
+    if args.workers == 1 or len(args.files) == 1:
+        for s in map(mesh_stats, args.files):
+            describe(s)
+        return
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for s in pool.map(mesh_stats, args.files, chunksize=16):
+            describe(s)
+
+
+def run(args: Namespace) -> None:
+    from .jobs import load_jobs, manifest_path, print_summary, run_jobs
+
+    workers, jobs = load_jobs(args.jobs)
+    results = run_jobs(
+        jobs,
+        workers=args.workers or workers,
+        start_method=args.start_method,
+        manifest=args.manifest or manifest_path(args.jobs),
+        resume=args.resume,
     )
+    print_summary(results)
+
+    if any(r.error for r in results):
+        sys.exit(1)
+
+
+def enqueue(args: Namespace) -> None:
+    from . import queue
+    from .jobs import load_jobs
+
+    _, jobs = load_jobs(args.jobs)
+    added = queue.enqueue(args.queue, jobs)
+    print(f"{len(added)} jobs queued")
+
+
+def worker(args: Namespace) -> None:
+    from .queue import DEFAULT_LEASE, run_worker
+
+    try:
+        results = run_worker(
+            args.queue,
+            once=args.once,
+            poll=args.poll,
+            lease=args.lease or DEFAULT_LEASE,
+        )
+    except KeyboardInterrupt:
+        return
+
+    if any(r.error for r in results):
+        sys.exit(1)
 
 
 def main():
     raw_args, raw_params = _split_args(sys.argv[1:])
 
     parser = ArgumentParser(description="Build a print module definition.")
-    subparsers = parser.add_subparsers()
-    parser.add_argument("module", nargs="+")
+    subparsers = parser.add_subparsers(required=True)
 
-    export_parser = subparsers.add_parser("export")
+    module_parser = ArgumentParser(add_help=False)
+    module_parser.add_argument("module", nargs="+")
+    presets_group = module_parser.add_mutually_exclusive_group()
+    presets_group.add_argument(
+        "--preset",
+        help="apply the named preset from the module's presets file before any "
+        "other params; exports are cached",
+    )
+    presets_group.add_argument(
+        "--params-file",
+        help="apply the params in this TOML file before any other params; "
+        "exports are cached",
+    )
+
+    export_parser = subparsers.add_parser("export", parents=[module_parser])
     export_parser.add_argument(
         "-o", "--out", type=str, help="destination file or folder", required=True
     )
@@ -293,32 +1000,268 @@ def main():
         action="append",
         help="export the parts matching the given names only; ignored when only one part is returned",
     )
+    export_parser.add_argument(
+        "--copies",
+        action="append",
+        help="add copies of a part to the 3mf, as name=count, or count for every "
+        "part; copies share a single mesh",
+    )
+    export_parser.add_argument(
+        "--step-timestamp",
+        action="store_true",
+        help="write the current time into step files' headers; by default a "
+        "fixed time is written, so that identical models export identically",
+    )
     export_parser.add_argument(
         "-t",
         "--type",
         default="3mf",
-        choices=("3mf", "step", "stl"),
+        choices=EXPORT_TYPES,
         help="export models as the given type; note this also determines the output file extension",
     )
+    export_parser.add_argument(
+        "--check",
+        default="off",
+        choices=CHECK_MODES,
+        help="check each part's mesh, as written, for open or inconsistently wound "
+        "edges, zero-area triangles and a volume that isn't positive; warn, "
+        "or fail the part's export",
+    )
+    export_parser.add_argument(
+        "--thumbnail",
+        action="store_true",
+        help="embed a rendered thumbnail of each part in its 3mf",
+    )
     export_parser.set_defaults(func=export)
 
-    view_parser = subparsers.add_parser("view")
+    thumbnail_parser = subparsers.add_parser(
+        "thumbnail",
+        parents=[module_parser],
+        help="render a PNG thumbnail of each part, without a GPU or display",
+    )
+    thumbnail_parser.add_argument(
+        "-o", "--out", type=str, help="destination file or folder", required=True
+    )
+    thumbnail_parser.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="overwrite destination file, if it exists",
+    )
+    thumbnail_parser.add_argument(
+        "-m",
+        "--mkdirp",
+        action="store_true",
+        help="create destination path if it does not exist",
+    )
+    thumbnail_parser.add_argument(
+        "--only",
+        action="append",
+        help="render the parts matching the given names only; ignored when only one part is returned",
+    )
+    thumbnail_parser.add_argument(
+        "-s",
+        "--size",
+        type=int,
+        default=THUMBNAIL_SIZE,
+        help="width and height of each thumbnail, in pixels",
+    )
+    thumbnail_parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        help="number of parts to render in parallel; defaults to the number of CPUs",
+    )
+    thumbnail_parser.set_defaults(func=thumbnails)
+
+    view_parser = subparsers.add_parser("view", parents=[module_parser])
+    view_parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="show the final parts only, with coarse tessellation",
+    )
+    view_parser.add_argument(
+        "--only",
+        action="append",
+        help="show the parts matching the given names only; ignored when only one part is returned",
+    )
+    view_parser.add_argument(
+        "--locals",
+        action=BooleanOptionalAction,
+        default=None,
+        help="show every builder and sketch created by the model; defaults to on, or off with --preview",
+    )
     view_parser.set_defaults(func=view)
 
-    args = parser.parse_args(args=raw_args)
+    estimate_parser = subparsers.add_parser(
+        "estimate",
+        parents=[module_parser],
+        help="estimate the filament needed for each part, without exporting",
+    )
+    estimate_parser.add_argument(
+        "--only",
+        action="append",
+        help="estimate the parts matching the given names only; ignored when only one part is returned",
+    )
+    estimate_parser.add_argument(
+        "--density",
+        type=float,
+        default=DEFAULT_DENSITY,
+        help="filament density, in g/cm³; defaults to PLA's",
+    )
+    estimate_parser.add_argument(
+        "--diameter",
+        type=float,
+        default=DEFAULT_DIAMETER,
+        help="filament diameter, in mm",
+    )
+    estimate_parser.add_argument(
+        "--time",
+        action="store_true",
+        help="also give a rough estimate of the print time",
+    )
+    estimate_parser.add_argument(
+        "--json", action="store_true", help="print the estimates as JSON"
+    )
+    estimate_parser.set_defaults(func=estimate)
 
-    mod_name = args.module[0]
-    validate_mod_name(mod_name)
-    mod = import_module(f".models.{mod_name}", "prints")
-    check_module(mod)
+    fit_parser = subparsers.add_parser(
+        "fit",
+        parents=[module_parser],
+        help="check the clearance between two parts; exits with an error when they interfere",
+    )
+    fit_parser.add_argument(
+        "--parts",
+        nargs=2,
+        required=True,
+        metavar=("A", "B"),
+        help="names of the parts to check",
+    )
+    fit_parser.add_argument(
+        "--move",
+        nargs=3,
+        type=float,
+        default=(0, 0, 0),
+        metavar=("X", "Y", "Z"),
+        help="move the second part by this offset, in mm",
+    )
+    fit_parser.add_argument(
+        "--rotate",
+        nargs=3,
+        type=float,
+        default=(0, 0, 0),
+        metavar=("X", "Y", "Z"),
+        help="rotate the second part about the origin, before moving it, by these "
+        "angles about each axis, in degrees",
+    )
+    fit_parser.add_argument(
+        "--resolution",
+        type=float,
+        default=DEFAULT_RESOLUTION,
+        help="spacing of the points sampled on each part's surface, in mm",
+    )
+    fit_parser.add_argument(
+        "--exact",
+        action="store_true",
+        help="also find the exact clearance, and any interfering volume, with OCC",
+    )
+    fit_parser.add_argument(
+        "--json", action="store_true", help="print the result as JSON"
+    )
+    fit_parser.set_defaults(func=fit)
 
-    param_parser = create_param_parser(mod.Params, description=mod.__doc__)
-    params = mod.Params()
-    param_parser.parse_args(raw_params, namespace=params)
+    inspect_parser = subparsers.add_parser(
+        "inspect", help="describe the meshes in exported stl and 3mf files"
+    )
+    inspect_parser.add_argument("files", nargs="+", help="stl or 3mf files")
+    inspect_parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        help="number of files to read in parallel; defaults to the number of CPUs",
+    )
+    inspect_parser.add_argument(
+        "--json",
+        action="store_true",
+        help="print each file's description, including its metadata, as JSON",
+    )
+    inspect_parser.set_defaults(func=inspect)
 
-    fname_suffix = ""
-    if s := serialize_params(raw_params):
-        fname_suffix = f"-{s}"
+    run_parser = subparsers.add_parser(
+        "run", help="run the export jobs described by a job file"
+    )
+    run_parser.add_argument("jobs", help="path to a TOML job file")
+    run_parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        help="number of jobs to run in parallel; defaults to the job file's "
+        "``workers``, or the number of CPUs",
+    )
+    run_parser.add_argument(
+        "--start-method",
+        choices=multiprocessing.get_all_start_methods(),
+        help="how worker processes are started; forkserver starts each worker "
+        "with the CAD libraries and models already imported",
+    )
+    run_parser.add_argument(
+        "--manifest",
+        help="append completed jobs to this manifest; defaults to the job file's "
+        "name, with a .manifest.jsonl extension",
+    )
+    run_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="skip jobs recorded as completed in the manifest",
+    )
+    run_parser.set_defaults(func=run)
+
+    enqueue_parser = subparsers.add_parser(
+        "enqueue", help="add the jobs described by a job file to a queue directory"
+    )
+    enqueue_parser.add_argument("jobs", help="path to a TOML job file")
+    enqueue_parser.add_argument(
+        "--queue", required=True, help="queue directory, shared with the workers"
+    )
+    enqueue_parser.set_defaults(func=enqueue)
+
+    worker_parser = subparsers.add_parser(
+        "worker", help="run jobs from a queue directory"
+    )
+    worker_parser.add_argument(
+        "--queue", required=True, help="queue directory, shared with the workers"
+    )
+    worker_parser.add_argument(
+        "--once",
+        action="store_true",
+        help="exit when the queue is empty, rather than waiting for more jobs",
+    )
+    worker_parser.add_argument(
+        "--poll",
+        type=float,
+        default=5,
+        help="seconds to wait between checks of an empty queue",
+    )
+    worker_parser.add_argument(
+        "--lease",
+        type=float,
+        help="seconds a claimed job may go without its worker renewing the claim "
+        "before another worker may run it; defaults to 10 minutes",
+    )
+    worker_parser.set_defaults(func=worker)
+
+    args = parser.parse_args(args=raw_args)
+
+    if "module" not in args:
+        # commands which don't operate on a single module handle their own args
+        args.func(args)
+        return
+
+    mod_name = args.module[0]
+    mod = load_module(mod_name)
+    params, fname_suffix = parse_params(
+        mod, raw_params, preset=args.preset, params_file=args.params_file
+    )
     args.func(
         mod_name,
         mod,
@@ -0,0 +1,202 @@
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any, cast
+
+from build123d import Part
+
+from .cache import (
+    DEPS_DIR,
+    cache_dir,
+    cache_size,
+    evict_cache,
+    module_digest,
+    read_shape,
+    write_shape,
+)
+from .params import ParamsBase, Result
+
+# the flattened parameter names read by the part builder currently running, if any
+_reads: ContextVar[set[str] | None] = ContextVar("_reads", default=None)
+
+
+@functools.cache
+def _fields(cls: type[ParamsBase]) -> frozenset[str]:
+    return frozenset(cls._annotations().keys())
+
+
+class TracedParams:
+    """
+    A read-through view of a ``ParamsBase`` which records the flattened names of
+    the parameters read from it while a ``part_builder`` is running.
+
+    Nested parameters are returned as traced views of their own, so that reads
+    from a subtree passed to a builder are recorded under their full name.
+    """
+
+    __slots__ = ("_params", "_root", "_path")
+
+    def __init__(
+        self,
+        params: ParamsBase,
+        root: ParamsBase | None = None,
+        path: tuple[str, ...] = (),
+    ) -> None:
+        object.__setattr__(self, "_params", params)
+        object.__setattr__(self, "_root", root if root is not None else params)
+        object.__setattr__(self, "_path", path)
+
+    @property
+    def __class__(self):
+        # allows traced params to pass ``isinstance`` checks for their class
+        return type(self._params)
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._params, name)
+        if name not in _fields(type(self._params)):
+            return value
+
+        path = (*self._path, name)
+        if isinstance(value, ParamsBase):
+            return TracedParams(value, self._root, path)
+
+        if (reads := _reads.get()) is not None:
+            reads.add(".".join(path))
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._params, name, value)
+
+    def _dict(self) -> dict[str, Any]:
+        # in the order of the params' own fields, for stable flattening
+        keys = self._params._annotations().keys()
+        return {key: getattr(self, key) for key in keys}
+
+
+def trace_params(params: ParamsBase) -> ParamsBase:
+    """
+    Wrap ``params`` so that ``part_builder`` functions can record their reads.
+    """
+    return cast(ParamsBase, TracedParams(params))
+
+
+def untrace_params(params: ParamsBase) -> ParamsBase:
+    """
+    The params wrapped by ``trace_params``, so that ``part_builder`` functions
+    build rather than serve their parts from the cache, with their ``locals``.
+    """
+    if type(params) is TracedParams:
+        return cast(TracedParams, params)._params
+    return params
+
+
+def _lookup(params: ParamsBase, name: str) -> Any:
+    value = params
+    for part in name.split("."):
+        value = getattr(value, part)
+    return value
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+
+def _deps_path(builder: str) -> str:
+    return os.path.join(cache_dir(), DEPS_DIR, f"{_digest(builder)}.json")
+
+
+def _read_deps(builder: str, source: str) -> dict[str, Any] | None:
+    try:
+        with open(_deps_path(builder)) as f:
+            deps = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if deps.get("source") != source:
+        return None
+    return deps
+
+
+def _write_deps(builder: str, deps: dict[str, Any]) -> None:
+    path = _deps_path(builder)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(deps, f)
+    os.replace(tmp_path, path)
+
+    evict_cache(cache_size())
+
+
+def _result_key(builder: str, source: str, root: ParamsBase, reads: list[str]) -> str:
+    return _digest(
+        {
+            "builder": builder,
+            "source": source,
+            "values": {name: _lookup(root, name) for name in reads},
+        }
+    )
+
+
+def part_builder(fn: Callable[..., Result]) -> Callable[..., Result]:
+    """
+    Record the parameters read by a part builder, and reuse its last output
+    when none of them have changed.
+
+    When called with traced params (see ``trace_params``), the flattened names
+    of every parameter the builder reads are stored on its ``Result`` and in the
+    cache. On the next call, the builder's part is served from the cache if the
+    values of those parameters are unchanged, along with the source of the
+    builder's module and of every module of ``prints`` it imports, and the
+    installed versions of its dependencies; otherwise it is rebuilt. Cached
+    results carry no ``locals``.
+
+    Builders called with untraced params run as usual.
+    """
+    builder = f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs) -> Result:
+        traced = [a for a in (*args, *kwargs.values()) if type(a) is TracedParams]
+        if not traced or not cache_size():
+            return fn(*args, **kwargs)
+
+        root = traced[0]._root
+        source = module_digest(fn.__module__)
+        # builders may call other builders; their reads belong to both
+        outer = _reads.get()
+
+        if (deps := _read_deps(builder, source)) is not None:
+            reads = deps["reads"]
+            key = _result_key(builder, source, root, reads)
+            if (part := read_shape(key, Part)) is not None:
+                if outer is not None:
+                    outer.update(reads)
+                return Result(
+                    part=part, locals=None, name=deps["name"], reads=frozenset(reads)
+                )
+
+        reads = set()
+        token = _reads.set(reads)
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            _reads.reset(token)
+
+        if outer is not None:
+            outer.update(reads)
+        result.reads = frozenset(reads)
+        write_shape(_result_key(builder, source, root, sorted(reads)), result.part)
+        _write_deps(
+            builder, {"source": source, "reads": sorted(reads), "name": result.name}
+        )
+
+        return result
+
+    return wrapper
@@ -0,0 +1,86 @@
+"""
+Estimates of the material and time needed to print a part, from its exact
+volume and surface area rather than a sliced or tessellated model.
+
+The print time estimate is a rough, linear model: the part's volume at the
+printer's volumetric flow rate, plus its surface area at the rate the outer
+perimeters cover it. It ignores travel, acceleration and supports.
+"""
+
+import math
+from dataclasses import dataclass
+
+from build123d import Part
+
+# PLA, in g/cm³
+DEFAULT_DENSITY = 1.24
+# in mm
+DEFAULT_DIAMETER = 1.75
+# in mm³/s
+DEFAULT_FLOW_RATE = 8.0
+# in mm²/s; perimeters at 40mm/s with 0.2mm layers
+DEFAULT_SURFACE_RATE = 8.0
+
+
+@dataclass
+class Estimate:
+    name: str
+    # in mm³
+    volume: float
+    # in mm²
+    area: float
+    # filament length, in mm
+    length: float
+    # in g
+    mass: float
+    # in s, when estimated
+    time: float | None = None
+
+
+def filament_length(volume: float, diameter: float = DEFAULT_DIAMETER) -> float:
+    """
+    The length of filament of the given ``diameter`` holding ``volume``.
+    """
+    return volume / (math.pi * (diameter / 2) ** 2)
+
+
+def mass(volume: float, density: float = DEFAULT_DENSITY) -> float:
+    """
+    The mass, in grams, of ``volume`` in mm³ of a material of ``density`` in
+    g/cm³.
+    """
+    return volume / 1000 * density
+
+
+def print_time(
+    volume: float,
+    area: float,
+    *,
+    flow_rate: float = DEFAULT_FLOW_RATE,
+    surface_rate: float = DEFAULT_SURFACE_RATE,
+) -> float:
+    """
+    A rough estimate of the seconds needed to print a part of the given
+    ``volume`` and surface ``area``.
+    """
+    return volume / flow_rate + area / surface_rate
+
+
+def estimate(
+    name: str,
+    part: Part,
+    *,
+    density: float = DEFAULT_DENSITY,
+    diameter: float = DEFAULT_DIAMETER,
+    time: bool = False,
+) -> Estimate:
+    volume = part.volume
+    area = part.area
+    return Estimate(
+        name=name,
+        volume=volume,
+        area=area,
+        length=filament_length(volume, diameter),
+        mass=mass(volume, density),
+        time=print_time(volume, area) if time else None,
+    )
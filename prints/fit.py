@@ -0,0 +1,242 @@
+"""
+Clearance checks between two parts, from samples of their tessellated surfaces
+rather than booleans.
+
+Each part's surface is sampled evenly, at roughly ``resolution`` mm apart. Every
+sample of one part is matched to the nearest triangles of the other, through a
+KD-tree of the other's samples, and its exact distance to those triangles is
+found. A sample behind the nearest triangle, against its normal, is inside the
+other part. Clearances are accurate to within about the sampling resolution;
+``exact`` adds the minimum distance found by OCC.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+from build123d import Shape
+
+from .mesh import shape_mesh
+
+DEFAULT_RESOLUTION = 0.5
+# tessellation of the sampled surfaces
+TESSELLATION_TOLERANCE = 0.01
+TESSELLATION_ANGULAR_TOLERANCE = 0.1
+# number of the nearest samples whose triangles are checked for each sample
+NEIGHBOURS = 16
+# in mm; the distances at which triangles are equally near a sample, and within
+# which the parts are touching rather than interfering
+TIE_TOLERANCE = 1e-6
+# a sample is behind a triangle when the cosine of the angle between its offset
+# and the triangle's normal is below this; near an edge, the offset to one of
+# the faces is perpendicular to it, and says nothing of the side
+SIDE_TOLERANCE = -0.01
+# samples compared at once, when scipy isn't available
+CHUNK_SIZE = 256
+
+
+@dataclass
+class Fit:
+    # the minimum distance between the parts' surfaces, in mm; negative when they
+    # interfere, by the deepest penetration found
+    clearance: float
+    interference: bool
+    # the minimum distance found by OCC, which is 0 when the parts interfere
+    exact_clearance: float | None = None
+    # the volume shared by the parts, when they interfere, in mm³
+    interference_volume: float | None = None
+
+
+@dataclass
+class Surface:
+    # the corners of each triangle, (n, 3, 3)
+    triangles: np.ndarray
+    # the outward unit normal of each triangle, (n, 3)
+    normals: np.ndarray
+    # points on the triangles, (m, 3), and the triangle each is on, (m,)
+    samples: np.ndarray
+    sample_triangles: np.ndarray
+
+
+def surface(shape: Shape, resolution: float = DEFAULT_RESOLUTION) -> Surface:
+    """
+    Tessellate ``shape``, and sample its surface about ``resolution`` mm apart.
+    """
+    points, indices = shape_mesh(
+        shape, TESSELLATION_TOLERANCE, TESSELLATION_ANGULAR_TOLERANCE
+    )
+    triangles = points[indices]
+
+    crossed = np.cross(
+        triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]
+    )
+    doubled_areas = np.linalg.norm(crossed, axis=1)
+    valid = doubled_areas > 0
+    triangles, crossed, doubled_areas = (
+        triangles[valid],
+        crossed[valid],
+        doubled_areas[valid],
+    )
+    normals = crossed / doubled_areas[:, None]
+
+    # uniform random points, as many per triangle as its area needs
+    counts = np.ceil(doubled_areas / 2 / resolution**2).astype(np.int64)
+    owners = np.repeat(np.arange(len(triangles)), counts)
+    # seeded, so that checks are repeatable
+    rng = np.random.default_rng(0)
+    r1 = np.sqrt(rng.random(len(owners)))
+    r2 = rng.random(len(owners))
+    corners = triangles[owners]
+    face_points = (
+        (1 - r1)[:, None] * corners[:, 0]
+        + (r1 * (1 - r2))[:, None] * corners[:, 1]
+        + (r1 * r2)[:, None] * corners[:, 2]
+    )
+
+    # and evenly spaced points along each edge, so that slivers, such as the top
+    # of a thin wall, are sampled across their length
+    starts = triangles.reshape(-1, 3)
+    ends = triangles[:, [1, 2, 0]].reshape(-1, 3)
+    edge_counts = np.ceil(np.linalg.norm(ends - starts, axis=1) / resolution)
+    edge_counts = edge_counts.astype(np.int64)
+    edges = np.repeat(np.arange(len(starts)), edge_counts)
+    positions = np.arange(len(edges)) - np.repeat(
+        np.cumsum(edge_counts) - edge_counts, edge_counts
+    )
+    t = ((positions + 0.5) / edge_counts[edges])[:, None]
+    edge_points = starts[edges] * (1 - t) + ends[edges] * t
+
+    samples = np.concatenate([face_points, edge_points, starts])
+    sample_triangles = np.concatenate(
+        [owners, edges // 3, np.repeat(np.arange(len(triangles)), 3)]
+    )
+
+    return Surface(triangles, normals, samples, sample_triangles)
+
+
+def closest_points(points: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """
+    The closest point to each of ``points`` on the corresponding triangle of
+    ``triangles``, as in Ericson's Real-Time Collision Detection, 5.1.5.
+    """
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    ab, ac, ap = b - a, c - a, points - a
+
+    def dot(u, v):
+        return np.einsum("ij,ij->i", u, v)
+
+    d1, d2 = dot(ab, ap), dot(ac, ap)
+    bp = points - b
+    d3, d4 = dot(ab, bp), dot(ac, bp)
+    cp = points - c
+    d5, d6 = dot(ab, cp), dot(ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # inside the face region
+        denom = va + vb + vc
+        v = vb / denom
+        w = vc / denom
+        result = a + ab * v[:, None] + ac * w[:, None]
+
+        # the edge regions, then the vertex regions, which take precedence
+        t = d1 / (d1 - d3)
+        edge = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        result[edge] = (a + ab * t[:, None])[edge]
+        t = d2 / (d2 - d6)
+        edge = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        result[edge] = (a + ac * t[:, None])[edge]
+        t = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        edge = (va <= 0) & ((d4 - d3) >= 0) & ((d5 - d6) >= 0)
+        result[edge] = (b + (c - b) * t[:, None])[edge]
+
+    result[(d1 <= 0) & (d2 <= 0)] = a[(d1 <= 0) & (d2 <= 0)]
+    result[(d3 >= 0) & (d4 <= d3)] = b[(d3 >= 0) & (d4 <= d3)]
+    result[(d6 >= 0) & (d5 <= d6)] = c[(d6 >= 0) & (d5 <= d6)]
+    return result
+
+
+def _neighbours(samples: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, len(samples))
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        pass
+    else:
+        _, idx = cKDTree(samples).query(queries, k=k, workers=-1)
+        return idx.reshape(len(queries), k)
+
+    # without scipy, compare every sample, a chunk of queries at a time
+    idx = np.empty((len(queries), k), dtype=np.int64)
+    squared = (samples**2).sum(axis=1)
+    for start in range(0, len(queries), CHUNK_SIZE):
+        chunk = queries[start : start + CHUNK_SIZE]
+        distances = squared[None, :] - 2 * chunk @ samples.T
+        idx[start : start + CHUNK_SIZE] = np.argpartition(distances, k - 1, axis=1)[
+            :, :k
+        ]
+    return idx
+
+
+def _signed_distances(queries: np.ndarray, target: Surface) -> np.ndarray:
+    """
+    The distance from each of ``queries`` to the ``target`` surface, negative
+    where the query is inside it.
+    """
+    # the distinct triangles of each query's nearest samples, as pairs of query
+    # and triangle, grouped by query
+    candidates = np.sort(
+        target.sample_triangles[_neighbours(target.samples, queries, NEIGHBOURS)],
+        axis=1,
+    )
+    distinct = np.ones(candidates.shape, dtype=bool)
+    distinct[:, 1:] = candidates[:, 1:] != candidates[:, :-1]
+    rows = np.nonzero(distinct)[0]
+    triangles = candidates[distinct]
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+
+    offsets = queries[rows] - closest_points(queries[rows], target.triangles[triangles])
+    distances = np.linalg.norm(offsets, axis=1)
+    nearest = np.minimum.reduceat(distances, starts)
+
+    # a point nearest an edge or corner is equally near several triangles, and
+    # the one it's most clearly in front of, or behind, decides its side
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sides = np.einsum("ij,ij->i", offsets, target.normals[triangles])
+        sides = np.nan_to_num(sides / distances)
+    tied = distances <= nearest[rows] + TIE_TOLERANCE
+    clearest = np.where(tied, np.abs(sides), -1)
+    chosen = clearest == np.maximum.reduceat(clearest, starts)[rows]
+    inside = np.minimum.reduceat(np.where(chosen, sides, 1), starts) < SIDE_TOLERANCE
+    return np.where(inside, -nearest, nearest)
+
+
+def fit(
+    a: Shape,
+    b: Shape,
+    *,
+    resolution: float = DEFAULT_RESOLUTION,
+    exact: bool = False,
+) -> Fit:
+    """
+    Find the clearance between ``a`` and ``b``, or how deeply they interfere.
+    """
+    surface_a, surface_b = surface(a, resolution), surface(b, resolution)
+    distances = np.concatenate(
+        [
+            _signed_distances(surface_b.samples, surface_a),
+            _signed_distances(surface_a.samples, surface_b),
+        ]
+    )
+    inside = distances[distances < -TIE_TOLERANCE]
+    interference = bool(len(inside))
+    clearance = float(inside.min() if interference else distances.min())
+
+    result = Fit(clearance=clearance, interference=interference)
+    if exact:
+        result.exact_clearance = a.distance_to(b)
+        if math.isclose(result.exact_clearance, 0, abs_tol=1e-9):
+            result.interference_volume = (a & b).volume
+    return result
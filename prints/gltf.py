@@ -0,0 +1,171 @@
+"""
+Binary glTF (GLB) export, for light previews of a model's parts in browsers.
+
+Each part is a node holding one mesh, whose vertices are welded and quantized to
+unsigned shorts, per ``KHR_mesh_quantization``; the node's scale and translation
+map them back to the part's coordinates. Normals are left for viewers to
+compute. A root node converts from millimeters, Z up, to glTF's meters, Y up.
+"""
+
+import json
+import math
+import struct
+from typing import Any
+
+import numpy as np
+
+from .mesh import Mesh, weld
+
+GLB_MAGIC = b"glTF"
+GLB_VERSION = 2
+JSON_CHUNK = b"JSON"
+BIN_CHUNK = b"BIN\x00"
+QUANTIZATION = "KHR_mesh_quantization"
+# the largest quantized coordinate
+QUANTIZED_MAX = 65535
+# tessellation of each part; coarser than other mesh exports, as it's a preview
+GLB_TOLERANCE = 0.02
+GLB_ANGULAR_TOLERANCE = 0.2
+
+# glTF enums
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+TRIANGLES = 4
+
+# a quarter turn about X, as a quaternion, and mm to m
+Z_UP_TO_Y_UP = [-math.sqrt(0.5), 0, 0, math.sqrt(0.5)]
+MM_TO_M = 0.001
+
+
+def _pad(data: bytes, fill: bytes = b"\x00") -> bytes:
+    return data + fill * (-len(data) % 4)
+
+
+def quantize(vertices: np.ndarray) -> tuple[np.ndarray, list[float], list[float]]:
+    """
+    Quantize ``vertices`` to unsigned shorts over their bounding box, returning
+    them along with the translation and scale which restore them.
+    """
+    low = vertices.min(axis=0)
+    extent = vertices.max(axis=0) - low
+    # flat extents have nothing to scale
+    scale = np.where(extent > 0, extent / QUANTIZED_MAX, 1)
+    quantized = np.rint((vertices - low) / scale).astype(np.uint16)
+    return quantized, low.tolist(), scale.tolist()
+
+
+def write_glb(
+    path: str, meshes: list[tuple[str, Mesh]], extras: dict[str, Any] | None = None
+) -> None:
+    """
+    Write each named mesh as a node of a GLB file at ``path``, with ``extras``
+    on every node.
+    """
+    gltf: dict[str, Any] = {
+        "asset": {"version": "2.0", "generator": "prints-ng"},
+        "extensionsUsed": [QUANTIZATION],
+        "extensionsRequired": [QUANTIZATION],
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [
+            {
+                "name": "root",
+                "rotation": Z_UP_TO_Y_UP,
+                "scale": [MM_TO_M] * 3,
+                "children": [],
+            }
+        ],
+        "meshes": [],
+        "accessors": [],
+        "bufferViews": [],
+    }
+    chunks: list[bytes] = []
+    offset = 0
+
+    def add_view(data: bytes, target: int, stride: int | None = None) -> int:
+        nonlocal offset
+        view: dict[str, Any] = {
+            "buffer": 0,
+            "byteOffset": offset,
+            "byteLength": len(data),
+            "target": target,
+        }
+        if stride:
+            view["byteStride"] = stride
+        chunks.append(_pad(data))
+        offset += len(chunks[-1])
+        gltf["bufferViews"].append(view)
+        return len(gltf["bufferViews"]) - 1
+
+    for name, (vertices, triangles) in meshes:
+        if not len(triangles):
+            raise ValueError(f"{name}: no triangles to export")
+        points, indices = weld(vertices[triangles])
+        quantized, translation, scale = quantize(points)
+
+        # vertex attributes are aligned to 4 bytes, so each position is padded
+        # to four shorts
+        padded = np.zeros((len(quantized), 4), dtype="<u2")
+        padded[:, :3] = quantized
+        positions = add_view(padded.tobytes(), ARRAY_BUFFER, stride=8)
+        gltf["accessors"].append(
+            {
+                "bufferView": positions,
+                "componentType": UNSIGNED_SHORT,
+                "count": len(quantized),
+                "type": "VEC3",
+                "min": quantized.min(axis=0).tolist(),
+                "max": quantized.max(axis=0).tolist(),
+            }
+        )
+
+        # the largest value of an index type is reserved
+        small = len(points) < np.iinfo(np.uint16).max
+        index_data = indices.astype("<u2" if small else "<u4").tobytes()
+        gltf["accessors"].append(
+            {
+                "bufferView": add_view(index_data, ELEMENT_ARRAY_BUFFER),
+                "componentType": UNSIGNED_SHORT if small else UNSIGNED_INT,
+                "count": indices.size,
+                "type": "SCALAR",
+            }
+        )
+
+        accessor = len(gltf["accessors"])
+        gltf["meshes"].append(
+            {
+                "name": name,
+                "primitives": [
+                    {
+                        "attributes": {"POSITION": accessor - 2},
+                        "indices": accessor - 1,
+                        "mode": TRIANGLES,
+                    }
+                ],
+            }
+        )
+        node: dict[str, Any] = {
+            "name": name,
+            "mesh": len(gltf["meshes"]) - 1,
+            "translation": translation,
+            "scale": scale,
+        }
+        if extras:
+            node["extras"] = extras
+        gltf["nodes"].append(node)
+        gltf["nodes"][0]["children"].append(len(gltf["nodes"]) - 1)
+
+    binary = b"".join(chunks)
+    gltf["buffers"] = [{"byteLength": len(binary)}]
+    content = _pad(json.dumps(gltf, separators=(",", ":")).encode(), b" ")
+
+    # the header, then each chunk with its length and type
+    length = 12 + 8 + len(content) + 8 + len(binary)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<4sII", GLB_MAGIC, GLB_VERSION, length))
+        f.write(struct.pack("<I4s", len(content), JSON_CHUNK))
+        f.write(content)
+        f.write(struct.pack("<I4s", len(binary), BIN_CHUNK))
+        f.write(binary)
@@ -0,0 +1,401 @@
+"""
+Export jobs described by a TOML job file, run in parallel.
+
+A job file lists any number of ``[[jobs]]``, each naming a ``module``, and
+optionally its parameter overrides, the export ``types``, the parts to export
+``only``, and an ``out`` path; a ``[defaults]`` table applies to every job::
+
+    workers = 4
+
+    [defaults]
+    out = "out/"
+
+    [[jobs]]
+    module = "led_ring"
+    types = ["3mf", "step"]
+    only = ["ring"]
+    params = { "ring.segments" = 4 }
+
+    [[jobs]]
+    module = "sonos_stand_foot"
+    copies = 4
+
+Parameter overrides use their flattened names, as in ``flatten_params``, or
+nested tables. ``copies`` of parts in a 3mf are either a count for every part,
+or a table of counts by part name. Relative ``out`` paths are relative to the job file; end them
+with a ``/`` to export into a directory.
+"""
+
+import contextlib
+import datetime
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import pkgutil
+import sys
+import time
+import tomllib
+import traceback
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any
+
+from . import models
+from .cli import EXPORT_TYPES, export, load_module, parse_params
+from .params import ParamsBase
+from .utils import (
+    Primitive,
+    file_digest,
+    flatten_overrides,
+    flatten_params,
+    override_args,
+)
+
+JOB_KEYS = {
+    "module",
+    "preset",
+    "params",
+    "types",
+    "only",
+    "copies",
+    "out",
+    "force",
+}
+
+
+@dataclass
+class Job:
+    module: str
+    # applied before ``params``, which may override it
+    preset: str | None = None
+    params: dict[str, Primitive] = field(default_factory=dict)
+    types: tuple[str, ...] = ("3mf",)
+    only: tuple[str, ...] = ()
+    # as given to ``--copies``
+    copies: tuple[str, ...] = ()
+    out: str = "./"
+    force: bool = False
+
+    def raw_params(self) -> list[str]:
+        """
+        The job's overrides, as they would be given on the command line.
+        """
+        return override_args(self.params)
+
+
+@dataclass
+class JobResult:
+    job: Job
+    fingerprint: str
+    outputs: list[str] = field(default_factory=list)
+    elapsed: float = 0
+    error: str | None = None
+    # whether the job was completed by an earlier run, per the manifest
+    resumed: bool = False
+
+
+def load_jobs(path: str) -> tuple[int | None, list[Job]]:
+    """
+    Load the jobs from the job file at ``path``, returning the file's requested
+    number of workers, if any, along with the jobs.
+    """
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+
+    root = os.path.dirname(os.path.abspath(path))
+    defaults = data.get("defaults", {})
+
+    jobs = []
+    for idx, spec in enumerate(data.get("jobs", [])):
+        spec = {**defaults, **spec}
+        if unknown := set(spec) - JOB_KEYS:
+            raise ValueError(f"job {idx}: unknown keys {', '.join(sorted(unknown))}")
+        if "module" not in spec:
+            raise ValueError(f"job {idx}: missing ``module``")
+
+        types = tuple(spec.get("types", ["3mf"]))
+        if invalid := set(types) - set(EXPORT_TYPES):
+            raise ValueError(f"job {idx}: unsupported types {', '.join(invalid)}")
+
+        copies = spec.get("copies", ())
+        if isinstance(copies, dict):
+            copies = tuple(f"{name}={count}" for name, count in copies.items())
+        elif isinstance(copies, int):
+            copies = (str(copies),)
+
+        out = spec.get("out", "./")
+        jobs.append(
+            Job(
+                module=spec["module"],
+                preset=spec.get("preset"),
+                params=flatten_overrides(spec.get("params", {})),
+                types=types,
+                only=tuple(spec.get("only", [])),
+                copies=copies,
+                # keep a trailing separator, which marks a directory
+                out=os.path.join(root, out),
+                force=spec.get("force", False),
+            )
+        )
+
+    return data.get("workers"), jobs
+
+
+def _parse_job_params(job: Job) -> tuple[ParamsBase, str]:
+    mod = load_module(job.module)
+    # the parser exits on unknown or invalid params, as suits the command line;
+    # here they fail the job alone
+    stderr = io.StringIO()
+    try:
+        with contextlib.redirect_stderr(stderr):
+            return parse_params(mod, job.raw_params(), preset=job.preset)
+    except SystemExit:
+        lines = stderr.getvalue().strip().splitlines() or ["invalid params"]
+        raise ValueError(lines[-1].partition("error: ")[2] or lines[-1]) from None
+
+
+def fingerprint(job: Job) -> str:
+    """
+    Identify a job by its canonical form: the module, every parameter value
+    after overrides are applied, and its export options.
+    """
+    params, _ = _parse_job_params(job)
+    canonical = {
+        "module": job.module,
+        # names the outputs
+        "preset": job.preset,
+        "params": flatten_params(params),
+        "types": sorted(job.types),
+        "only": sorted(job.only),
+        "copies": sorted(job.copies),
+        "out": job.out,
+    }
+    encoded = json.dumps(canonical, sort_keys=True)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def run_job(job: Job, job_fingerprint: str) -> JobResult:
+    result = JobResult(job=job, fingerprint=job_fingerprint)
+    start = time.perf_counter()
+    try:
+        mod = load_module(job.module)
+        params, fname_suffix = _parse_job_params(job)
+        for export_type in job.types:
+            args = Namespace(
+                out=job.out,
+                mkdirp=True,
+                force=job.force,
+                only=list(job.only) or None,
+                # copies apply to the job's 3mf export, and no other
+                copies=(list(job.copies) or None) if export_type == "3mf" else None,
+                step_timestamp=False,
+                type=export_type,
+                preset=job.preset,
+                params_file=None,
+                thumbnail=False,
+                check="off",
+            )
+            result.outputs.extend(
+                export(
+                    job.module,
+                    mod,
+                    args=args,
+                    params=params,
+                    fname_suffix=fname_suffix,
+                )
+            )
+    except Exception:
+        result.error = traceback.format_exc()
+    result.elapsed = time.perf_counter() - start
+
+    return result
+
+
+def manifest_path(jobs_path: str) -> str:
+    return f"{os.path.splitext(jobs_path)[0]}.manifest.jsonl"
+
+
+def read_manifest(path: str) -> dict[str, dict[str, Any]]:
+    """
+    Read the completed jobs recorded in the manifest at ``path``, by fingerprint.
+    """
+    completed = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # a line cut short when a run was killed mid-write
+                    continue
+                completed[record["fingerprint"]] = record
+    except FileNotFoundError:
+        pass
+
+    return completed
+
+
+def result_record(result: JobResult) -> dict[str, Any]:
+    """
+    Describe a completed job, with a hash of each of its outputs.
+    """
+    return {
+        "fingerprint": result.fingerprint,
+        "module": result.job.module,
+        "params": result.job.params,
+        "outputs": [{"path": p, "sha256": file_digest(p)} for p in result.outputs],
+        "elapsed": result.elapsed,
+        "completed": datetime.datetime.now().isoformat(),
+    }
+
+
+def append_manifest(path: str, result: JobResult) -> None:
+    record = f"{json.dumps(result_record(result))}\n".encode()
+    with open(path, "ab+") as f:
+        # a record cut short when a run was killed is left on a line of its own,
+        # rather than joined to this one
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                record = b"\n" + record
+        f.write(record)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _is_complete(record: dict[str, Any]) -> bool:
+    # outputs that were since removed or changed need to be generated again
+    for output in record["outputs"]:
+        try:
+            if file_digest(output["path"]) != output["sha256"]:
+                return False
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def preload_modules() -> list[str]:
+    """
+    The modules imported by a job, which are slow to import: the CAD libraries,
+    and every model.
+    """
+    return [
+        "build123d",
+        "OCP",
+        "bd_warehouse",
+        __name__,
+        *(f"{models.__name__}.{m.name}" for m in pkgutil.iter_modules(models.__path__)),
+    ]
+
+
+def process_pool(
+    workers: int | None = None, start_method: str | None = None
+) -> ProcessPoolExecutor:
+    """
+    Create a pool of ``workers`` processes, started with the given
+    multiprocessing ``start_method``, or the platform's default.
+
+    With ``forkserver``, the server imports ``preload_modules`` once, so that
+    each worker forked from it starts with them already imported.
+    """
+    context = multiprocessing.get_context(start_method)
+    if start_method == "forkserver":
+        context.set_forkserver_preload(preload_modules())
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(), mp_context=context
+    )
+
+
+def run_jobs(
+    jobs: list[Job],
+    *,
+    workers: int | None = None,
+    start_method: str | None = None,
+    manifest: str | None = None,
+    resume: bool = False,
+) -> list[JobResult]:
+    """
+    Run ``jobs`` across ``workers`` processes (see ``process_pool``), skipping
+    any job identical to one before it. Jobs whose parameters fail validation
+    are not run, and fail immediately. Results are returned in job order.
+
+    Each completed job is appended to the ``manifest``, if given. With
+    ``resume``, jobs the manifest records as completed are skipped, as long as
+    their outputs are unchanged.
+    """
+    unique: dict[str, Job] = {}
+    results: dict[str, JobResult] = {}
+    # the key of each job's result, in job order
+    order: list[str] = []
+    for idx, job in enumerate(jobs):
+        try:
+            job_fingerprint = fingerprint(job)
+        except ValueError as e:
+            # invalid jobs fail without being scheduled
+            print(f"skipping invalid job: {job.module} {job.raw_params()}: {e}")
+            results[f"invalid-{idx}"] = JobResult(
+                job=job, fingerprint="", error=f"ValueError: {e}"
+            )
+            order.append(f"invalid-{idx}")
+            continue
+        if job_fingerprint in unique:
+            print(f"skipping duplicate job: {job.module} {job.raw_params()}")
+            continue
+        unique[job_fingerprint] = job
+        order.append(job_fingerprint)
+
+    if manifest and resume:
+        for fp, record in read_manifest(manifest).items():
+            if fp in unique and _is_complete(record):
+                results[fp] = JobResult(
+                    job=unique[fp],
+                    fingerprint=fp,
+                    outputs=[o["path"] for o in record["outputs"]],
+                    elapsed=record["elapsed"],
+                    resumed=True,
+                )
+
+    with process_pool(workers, start_method) as pool:
+        futures = {
+            pool.submit(run_job, job, fp): fp
+            for fp, job in unique.items()
+            if fp not in results
+        }
+        for future in as_completed(futures):
+            fp = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                result = JobResult(
+                    job=unique[fp], fingerprint=fp, error="worker process died"
+                )
+            if result.error:
+                print(result.error, file=sys.stderr)
+            elif manifest:
+                append_manifest(manifest, result)
+            results[fp] = result
+
+    return [results[key] for key in order]
+
+
+def print_summary(results: list[JobResult]) -> None:
+    for r in results:
+        status = "failed" if r.error else "resumed" if r.resumed else "ok"
+        detail = (
+            r.error.strip().splitlines()[-1] if r.error else f"{len(r.outputs)} files"
+        )
+        print(
+            f"{status:<7}  {r.job.module:<24}  {r.fingerprint[:10]}  "
+            f"{r.elapsed:7.2f}s  {detail}"
+        )
+
+    failed = sum(1 for r in results if r.error)
+    resumed = sum(1 for r in results if r.resumed)
+    print(
+        f"{len(results)} jobs: {len(results) - failed - resumed} ok, "
+        f"{resumed} resumed, {failed} failed"
+    )
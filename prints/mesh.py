@@ -0,0 +1,352 @@
+"""
+Meshes as NumPy arrays: read from exported files without a CAD kernel, for
+quick inspection of many files, or tessellated from shapes.
+
+Binary STLs are memory-mapped, and 3mf models are parsed as a stream, so each
+file's triangles go straight into arrays. Shapes' triangulations are copied from
+OCC face by face; each node is still read through OCP, one call per vertex, but
+into a preallocated array rather than as build123d vectors.
+"""
+
+import itertools
+import os
+import re
+import zipfile
+from dataclasses import dataclass, field
+from xml.etree import ElementTree
+
+import numpy as np
+from build123d import Shape
+from OCP.BRep import BRep_Tool
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.BRepTools import BRepTools
+from OCP.TopAbs import TopAbs_FACE, TopAbs_REVERSED
+from OCP.TopExp import TopExp_Explorer
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopoDS import TopoDS
+
+# tessellation used by mesh exports; fixed so that a part always meshes the same
+MESH_TOLERANCE = 1e-3
+MESH_ANGULAR_TOLERANCE = 0.1
+
+STL_HEADER_SIZE = 80
+STL_DTYPE = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attr", "<u2")]
+)
+MODEL_PATH = "3D/3dmodel.model"
+# in mm²; triangles this small, or smaller, are degenerate
+MIN_TRIANGLE_AREA = 1e-12
+# in mm; OCC meshes each face separately, placing the nodes of an edge between
+# two faces at coordinates which may differ in their last bits
+WELD_TOLERANCE = 1e-6
+
+# a mesh, as its vertices and the vertex indices of each triangle
+Mesh = tuple[np.ndarray, np.ndarray]
+
+
+@dataclass
+class MeshStats:
+    path: str
+    triangles: int
+    # min x, y, z, then max x, y, z; in mm
+    bbox: tuple[float, ...]
+    # in mm³
+    volume: float
+    # whether every edge joins exactly two triangles, consistently oriented
+    watertight: bool
+    # custom metadata, such as the params a 3mf was exported with
+    metadata: dict[str, str] = field(default_factory=dict)
+
+
+def _clusters(points: np.ndarray, tolerance: float) -> np.ndarray:
+    # label points, so that any two closer than ``tolerance`` along every axis
+    # share a label. Points are binned into cells twice that size, on each of
+    # the eight grids offset by half a cell along any of the axes: two such
+    # points are split by the cell boundaries of at most one grid per axis, so
+    # share a cell in some grid. Labels spread to the lowest of each cell, in
+    # every grid, until they settle
+    cells = []
+    for offset in itertools.product((0, tolerance), repeat=3):
+        grid = np.floor((points + offset) / (2 * tolerance)).astype(np.int64)
+        keys = grid.view(np.dtype((np.void, grid.dtype.itemsize * 3))).ravel()
+        _, cell = np.unique(keys, return_inverse=True)
+        cells.append(cell)
+
+    labels = np.arange(len(points))
+    while True:
+        previous = labels
+        for cell in cells:
+            lowest = np.full(cell.max(initial=0) + 1, len(points))
+            np.minimum.at(lowest, cell, labels)
+            labels = lowest[cell]
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def weld(triangles: np.ndarray, tolerance: float = 0) -> Mesh:
+    """
+    Merge the corners of ``triangles``, an (m, 3, 3) array, at identical
+    coordinates, as STLs repeat them per triangle. Given a ``tolerance``, corners
+    closer than it along every axis are merged too, as may be corners up to
+    twice as far apart, and chains of corners each close to the next.
+    """
+    points = np.ascontiguousarray(triangles.reshape(-1, 3))
+    keys = points.view(np.dtype((np.void, points.dtype.itemsize * 3))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    points, inverse = points[first], inverse.reshape(-1, 3)
+    if not tolerance or not len(points):
+        return points, inverse
+
+    _, first, merged = np.unique(
+        _clusters(points, tolerance), return_index=True, return_inverse=True
+    )
+    return points[first], merged[inverse]
+
+
+def read_stl(path: str) -> Mesh:
+    """
+    Read a binary, or ASCII, STL.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.seek(STL_HEADER_SIZE)
+        count = int(np.frombuffer(f.read(4), "<u4")[0]) if size >= 84 else -1
+
+    if size == STL_HEADER_SIZE + 4 + count * STL_DTYPE.itemsize:
+        if count == 0:
+            return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+        records = np.memmap(
+            path, dtype=STL_DTYPE, mode="r", offset=STL_HEADER_SIZE + 4, shape=count
+        )
+        return weld(records["vertices"])
+
+    with open(path, "rb") as f:
+        content = f.read()
+    if not content.lstrip().startswith(b"solid"):
+        raise ValueError(f"{path}: not an STL")
+    values = re.findall(rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)", content)
+    return weld(np.array(values, dtype=np.float32).reshape(-1, 3, 3))
+
+
+def _transform(value: str | None) -> np.ndarray:
+    # 3mf transforms are the first three columns of an affine matrix, row-major,
+    # applied to row vectors
+    matrix = np.eye(4)
+    if value:
+        matrix[:, :3] = np.array(value.split(), dtype=np.float64).reshape(4, 3)
+    return matrix
+
+
+def read_3mf(path: str) -> tuple[list[Mesh], dict[str, str]]:
+    """
+    Read the meshes placed by each build item of a 3mf, with their transforms
+    applied, along with its custom metadata.
+    """
+    meshes: dict[str, Mesh] = {}
+    components: dict[str, list[tuple[str, np.ndarray]]] = {}
+    items: list[tuple[str, np.ndarray]] = []
+    metadata: dict[str, str] = {}
+
+    vertices: list[tuple[str, str, str]] = []
+    triangles: list[tuple[str, str, str]] = []
+    parts: list[tuple[str, np.ndarray]] = []
+    with zipfile.ZipFile(path) as archive, archive.open(MODEL_PATH) as f:
+        for event, elem in ElementTree.iterparse(f, events=("start", "end")):
+            tag = elem.tag.rpartition("}")[2]
+            if event == "start":
+                if tag == "object":
+                    vertices, triangles, parts = [], [], []
+                continue
+
+            if tag == "vertex":
+                vertices.append((elem.get("x"), elem.get("y"), elem.get("z")))
+            elif tag == "triangle":
+                triangles.append((elem.get("v1"), elem.get("v2"), elem.get("v3")))
+            elif tag == "component":
+                parts.append((elem.get("objectid"), _transform(elem.get("transform"))))
+            elif tag == "object":
+                if vertices:
+                    meshes[elem.get("id")] = (
+                        np.array(vertices, dtype=np.float64),
+                        np.array(triangles, dtype=np.int64),
+                    )
+                elif parts:
+                    components[elem.get("id")] = parts
+            elif tag == "item":
+                items.append((elem.get("objectid"), _transform(elem.get("transform"))))
+            elif tag == "metadata":
+                name = elem.get("name", "")
+                # custom metadata names are prefixed by their namespace
+                if ":" in name:
+                    metadata[name.partition(":")[2]] = elem.text or ""
+            elem.clear()
+
+    def place(object_id: str, transform: np.ndarray) -> list[Mesh]:
+        if object_id in meshes:
+            points, indices = meshes[object_id]
+            points = points @ transform[:3, :3] + transform[3, :3]
+            return [(points, indices)]
+        return [
+            mesh
+            for part_id, part_transform in components.get(object_id, [])
+            for mesh in place(part_id, part_transform @ transform)
+        ]
+
+    placed = [mesh for object_id, t in items for mesh in place(object_id, t)]
+    return placed, metadata
+
+
+_POINT = np.dtype((np.float64, 3))
+_TRIANGLE = np.dtype((np.int32, 3))
+
+
+def shape_mesh(
+    shape: Shape,
+    tolerance: float = MESH_TOLERANCE,
+    angular_tolerance: float = MESH_ANGULAR_TOLERANCE,
+) -> Mesh:
+    """
+    Tessellate ``shape``, returning its vertices as an (n, 3) float64 array and
+    its triangles as an (m, 3) int32 array of vertex indices, wound
+    counter-clockwise seen from outside. Each face has its own vertices, so
+    those on the edges between faces are repeated.
+
+    Any existing triangulation of the shape is replaced, so that the given
+    tolerances always apply.
+    """
+    BRepTools.Clean_s(shape.wrapped)
+    BRepMesh_IncrementalMesh(shape.wrapped, tolerance, False, angular_tolerance, True)
+
+    vertices, triangles = [], []
+    offset = 0
+    explorer = TopExp_Explorer(shape.wrapped, TopAbs_FACE)
+    while explorer.More():
+        face = TopoDS.Face_s(explorer.Current())
+        explorer.Next()
+        location = TopLoc_Location()
+        triangulation = BRep_Tool.Triangulation_s(face, location)
+        if triangulation is None:
+            continue
+
+        count = triangulation.NbNodes()
+        node = triangulation.Node
+        points = np.fromiter(
+            (node(i).Coord() for i in range(1, count + 1)), _POINT, count
+        )
+        if not location.IsIdentity():
+            trsf = location.Transformation()
+            matrix = np.array(
+                [[trsf.Value(r, c) for c in range(1, 5)] for r in range(1, 4)]
+            )
+            points = points @ matrix[:, :3].T + matrix[:, 3]
+
+        indices = np.fromiter(
+            (t.Get() for t in triangulation.Triangles()),
+            _TRIANGLE,
+            triangulation.NbTriangles(),
+        )
+        if face.Orientation() == TopAbs_REVERSED:
+            indices = indices[:, [0, 2, 1]]
+
+        vertices.append(points)
+        # OCC's indices start at 1
+        triangles.append(indices + (offset - 1))
+        offset += count
+
+    if not vertices:
+        return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int32)
+    return np.concatenate(vertices), np.concatenate(triangles)
+
+
+def _volume(points: np.ndarray, indices: np.ndarray) -> float:
+    v0, v1, v2 = (points[indices[:, i]] for i in range(3))
+    return float(np.einsum("ij,ij->i", v0, np.cross(v1, v2)).sum() / 6)
+
+
+def _watertight(indices: np.ndarray, vertex_count: int) -> bool:
+    if not len(indices):
+        return False
+    starts = indices.ravel()
+    ends = indices[:, [1, 2, 0]].ravel()
+    edges = starts * vertex_count + ends
+    # each directed edge appears once, and its reverse belongs to a neighbour
+    if len(np.unique(edges)) != len(edges):
+        return False
+    return bool(np.isin(ends * vertex_count + starts, edges).all())
+
+
+def check_mesh(mesh: Mesh) -> list[str]:
+    """
+    Describe the problems a slicer would have with ``mesh``: edges not shared by
+    exactly two triangles, neighbouring triangles wound in opposite directions,
+    zero-area triangles and a volume that isn't positive. Empty when there are
+    none. Vertices within ``WELD_TOLERANCE`` of each other are merged first;
+    triangles collapsed by that to an edge or a point, as at the poles of
+    spheres, are dropped, as 3mf exports and slicers do.
+    """
+    vertices, triangles = mesh
+    if not len(triangles):
+        return ["no triangles"]
+    points, indices = weld(vertices[triangles], WELD_TOLERANCE)
+    problems = []
+
+    collapsed = (
+        (indices[:, 0] == indices[:, 1])
+        | (indices[:, 1] == indices[:, 2])
+        | (indices[:, 2] == indices[:, 0])
+    )
+    indices = indices[~collapsed]
+
+    corners = points[indices]
+    areas = np.linalg.norm(
+        np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]),
+        axis=1,
+    )
+    if degenerate := int((areas / 2 <= MIN_TRIANGLE_AREA).sum()):
+        problems.append(f"{degenerate} zero-area triangles")
+
+    count = len(points)
+    starts = indices.ravel()
+    ends = indices[:, [1, 2, 0]].ravel()
+    edges = np.minimum(starts, ends) * count + np.maximum(starts, ends)
+    unique, counts = np.unique(edges, return_counts=True)
+    if unmatched := int((counts != 2).sum()):
+        problems.append(f"{unmatched} edges not shared by exactly two triangles")
+
+    # the two triangles sharing an edge run along it in opposite directions
+    shared = np.isin(edges, unique[counts == 2])
+    _, directions = np.unique(starts[shared] * count + ends[shared], return_counts=True)
+    if flipped := int((directions > 1).sum()):
+        problems.append(f"{flipped} edges between inconsistently wound triangles")
+
+    if (volume := _volume(points, indices)) <= 0:
+        problems.append(f"volume of {volume:.3f} mm³ is not positive")
+
+    return problems
+
+
+def mesh_stats(path: str) -> MeshStats:
+    """
+    Describe the mesh in the STL or 3mf at ``path``.
+    """
+    metadata = {}
+    if path.lower().endswith(".3mf"):
+        meshes, metadata = read_3mf(path)
+    else:
+        meshes = [read_stl(path)]
+
+    meshes = [(p, i) for p, i in meshes if len(i)]
+    if meshes:
+        points = np.concatenate([p for p, _ in meshes])
+        bbox = (*points.min(axis=0).tolist(), *points.max(axis=0).tolist())
+    else:
+        bbox = (0.0,) * 6
+
+    return MeshStats(
+        path=path,
+        triangles=sum(len(i) for _, i in meshes),
+        bbox=bbox,
+        volume=sum(_volume(p, i) for p, i in meshes),
+        watertight=bool(meshes) and all(_watertight(i, len(p)) for p, i in meshes),
+        metadata=metadata,
+    )
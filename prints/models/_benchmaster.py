@@ -1,5 +1,6 @@
 from build123d import *
 
+from prints.cache import cached_shape
 from prints.params import ParamsBase
 
 
@@ -12,6 +13,7 @@ class LouvreParams(ParamsBase):
     min_thickness: float = 3
 
 
+@cached_shape
 def louvre_blank(params: LouvreParams) -> Part:
     width = params.slot_width + params.min_thickness * 2 + params.slot_depth * 2
     height = params.total_height
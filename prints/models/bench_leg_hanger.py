@@ -1,6 +1,6 @@
 from build123d import *
 
-from prints import ParamsBase, Result
+from prints import ParamsBase, Result, topology
 
 
 class Params(ParamsBase):
@@ -30,7 +30,7 @@ def main(params: Params) -> Result:
         extrude(sk.sketch, amount=part_thickness)
 
         # dowel cutout; this goes on the upper face as far to the top right as it can
-        face = part.faces().sort_by(Axis.Z).last
+        face = topology(part).faces().sort_by(Axis.Z).last
         vertex = face.vertices()[1]
         with Locations(vertex - (params.thickness, 0, 0)):
             Cylinder(
@@ -48,7 +48,7 @@ def main(params: Params) -> Result:
             )
 
         # front angle cut
-        face = part.faces().sort_by(Axis.Y).first
+        face = topology(part).faces().sort_by(Axis.Y).first
         assert face.width
         assert face.length
         with BuildSketch(face) as sk:
@@ -63,13 +63,13 @@ def main(params: Params) -> Result:
         extrude(sk.sketch, amount=-part_thickness, mode=Mode.SUBTRACT)
 
         # post slot
-        with BuildSketch(part.faces().sort_by(Axis.Y).last) as sk:
+        with BuildSketch(topology(part).faces().sort_by(Axis.Y).last) as sk:
             Rectangle(params.post_width, params.post_depth)
         extrude(sk.sketch, amount=-params.post_width, mode=Mode.SUBTRACT)
 
         # post insert cutout; we're putting this on the face of the post slot,
         # second Z-axis from the bottom
-        face = part.faces().sort_by(Axis.Z)[1]
+        face = topology(part).faces().sort_by(Axis.Z)[1]
         assert face.width
         assert face.length
         with BuildSketch(face) as sk:
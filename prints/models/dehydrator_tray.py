@@ -1,6 +1,6 @@
 from build123d import *
 
-from prints import ParamsBase, Result
+from prints import ParamsBase, Result, pattern_cut, topology
 
 
 class Params(ParamsBase):
@@ -15,6 +15,13 @@ class Params(ParamsBase):
     inner_offset: float = 1.0
     inner: bool = True
 
+    def validate(self) -> None:
+        super().validate()
+        if self.grid_num_x < 1 or self.grid_num_y < 1:
+            raise ValueError("grid_num_x and grid_num_y must be at least 1")
+        if self.thickness <= 0:
+            raise ValueError("thickness must be positive")
+
 
 def _inner(params: Params) -> Result:
     width = params.width - params.thickness * 2 - params.inner_offset
@@ -27,15 +34,15 @@ def _inner(params: Params) -> Result:
 
         extrude(amount=height)
 
-        topf = part.faces().sort_by(Axis.Z).last
+        topf = topology(part).faces().sort_by(Axis.Z).last
         offset(amount=-params.thickness, openings=topf)
 
         exterior_faces = (
-            part.faces().filter_by(Plane.YZ)[0:2]
-            + part.faces().filter_by(Plane.XZ)[0:2]
+            topology(part).faces().filter_by(Plane.YZ)[0:2]
+            + topology(part).faces().filter_by(Plane.XZ)[0:2]
         )
 
-        basef = part.faces().sort_by(Axis.Z)[1]
+        basef = topology(part).faces().sort_by(Axis.Z)[1]
         assert basef.length
         g_width = basef.length - params.thickness * 2
         assert basef.width
@@ -46,11 +53,15 @@ def _inner(params: Params) -> Result:
 
         extrude(amount=-params.thickness, mode=Mode.SUBTRACT)
 
+        screw_holes = []
         for f in exterior_faces:
-            with BuildSketch(f):
+            with BuildSketch(f, mode=Mode.PRIVATE) as screw_sk:
                 Circle(radius=params.screw_d / 2)
 
-            extrude(amount=-params.thickness, mode=Mode.SUBTRACT)
+            screw_holes.append(
+                extrude(screw_sk.sketch, amount=-params.thickness, mode=Mode.PRIVATE)
+            )
+        pattern_cut(screw_holes)
 
     assert part.part
     return Result(part=part.part, locals=locals())
@@ -62,14 +73,15 @@ def _outer(params: Params) -> Result:
             Rectangle(width=params.width, height=params.depth)
         extrude(amount=params.height)
 
-        topf = part.faces().sort_by(Axis.Z).last
+        topf = topology(part).faces().sort_by(Axis.Z).last
         offset(amount=-params.thickness, openings=topf)
 
         interior_faces = (
-            part.faces().filter_by(Plane.YZ)[2:] + part.faces().filter_by(Plane.XZ)[2:]
+            topology(part).faces().filter_by(Plane.YZ)[2:]
+            + topology(part).faces().filter_by(Plane.XZ)[2:]
         )
 
-        basef = part.faces().sort_by(Axis.Z)[1]
+        basef = topology(part).faces().sort_by(Axis.Z)[1]
         assert basef.length
         g_width = basef.length - params.thickness * 2
         assert basef.width
@@ -78,7 +90,7 @@ def _outer(params: Params) -> Result:
         rect_width = g_width / params.grid_num_x
         rect_depth = g_depth / params.grid_num_y
 
-        with BuildSketch(basef) as grid_sk:
+        with BuildSketch(basef, mode=Mode.PRIVATE) as grid_sk:
             with GridLocations(
                 x_spacing=rect_width,
                 x_count=params.grid_num_x,
@@ -90,13 +102,19 @@ def _outer(params: Params) -> Result:
                     height=rect_depth - params.grid_spacing,
                 )
 
-        extrude(amount=-params.thickness, mode=Mode.SUBTRACT)
+        pattern_cut(
+            extrude(grid_sk.sketch, amount=-params.thickness, mode=Mode.PRIVATE)
+        )
 
+        screw_holes = []
         for f in interior_faces:
-            with BuildSketch(f):
+            with BuildSketch(f, mode=Mode.PRIVATE) as screw_sk:
                 Circle(radius=params.screw_d / 2)
 
-            extrude(amount=-params.thickness, mode=Mode.SUBTRACT)
+            screw_holes.append(
+                extrude(screw_sk.sketch, amount=-params.thickness, mode=Mode.PRIVATE)
+            )
+        pattern_cut(screw_holes)
 
     assert part.part
     return Result(part=part.part, locals=locals())
@@ -1,6 +1,6 @@
 from build123d import *
 
-from prints import ParamsBase, Result
+from prints import ParamsBase, Result, pattern_cut, topology
 
 
 class Params(ParamsBase):
@@ -43,18 +43,18 @@ def main(params: Params) -> Result:
             make_face()
         extrude(amount=params.depth)
 
-        topf = part.faces().sort_by(Axis.Z)[-1]
+        topf = topology(part).faces().sort_by(Axis.Z)[-1]
         chamfer(topf.edges(), length=params.top_chamfer)
-        edges = part.edges().filter_by(Axis.Z)
+        edges = topology(part).edges().filter_by(Axis.Z)
         fillet(edges, radius=params.corner_r)
-        bottomf = part.faces().sort_by(Axis.Z)[0]
+        bottomf = topology(part).faces().sort_by(Axis.Z)[0]
         offset(openings=bottomf, amount=-params.thickness)
 
-        topf = part.faces().sort_by(Axis.Z)[-1]
-        with BuildSketch(Plane(topf)):
+        topf = topology(part).faces().sort_by(Axis.Z)[-1]
+        with BuildSketch(Plane(topf), mode=Mode.PRIVATE) as hex_sk:
             with HexLocations(radius=params.hole_r * 2, x_count=10, y_count=4):
                 RegularPolygon(radius=params.hole_r, side_count=6)
-        extrude(amount=-params.thickness, mode=Mode.SUBTRACT)
+        pattern_cut(extrude(hex_sk.sketch, amount=-params.thickness, mode=Mode.PRIVATE))
 
         # left tab
         with BuildSketch() as left_tab_sk:
@@ -105,7 +105,7 @@ def main(params: Params) -> Result:
         extrude(amount=-params.tab_thickness, mode=Mode.SUBTRACT)
 
         if params.switch:
-            leftf = part.faces().filter_by(Axis.X).sort_by(Axis.X)[-4]
+            leftf = topology(part).faces().filter_by(Axis.X).sort_by(Axis.X)[-4]
             assert leftf.width
             with BuildSketch(Plane(leftf)):
                 with Locations((leftf.width / 4, 0)):
@@ -14,11 +14,15 @@ the inner and outer surfaces, but is a separate model because it's useful in
 other contexts.
 """
 
+from collections.abc import Iterator
+
 from build123d import *
 from bd_warehouse import thread
 
 from prints import ParamsBase, Result
+from prints.cache import cached_shape
 from prints.constants import M3X5_7_INSERT
+from prints.deps import part_builder
 
 # from published specs, the philips TL-E 32W bulb is between 236.5mm and 246.1mm
 # inner diameter, and the tube has a diameter between 26.2mm and 30.9 mm; we'll
@@ -71,6 +75,11 @@ class RingParams(ParamsBase):
     height: float = 8
     segments: int = 3
 
+    def validate(self) -> None:
+        super().validate()
+        if self.segments < 1:
+            raise ValueError("segments must be at least 1")
+
 
 class CordInsertParams(ParamsBase):
     inner_d: float = 8
@@ -106,6 +115,7 @@ class Params(_Shared):
     cord_end_cover: CordEndCoverParams = CordEndCoverParams()
 
 
+@part_builder
 def _cord_end_cover(insert: CordInsertParams, params: CordEndCoverParams) -> Result:
     with BuildPart() as part:
         with BuildSketch() as lower_sk:
@@ -141,13 +151,29 @@ def _cord_end_cover(insert: CordInsertParams, params: CordEndCoverParams) -> Res
     return Result(name="cord_end_cover", part=part.part, locals=locals())
 
 
+@cached_shape
+def _iso_thread(
+    diameter: float, pitch: float, length: float, end_finishes: tuple[str, str]
+) -> Part:
+    return thread.IsoThread(
+        major_diameter=diameter,
+        pitch=pitch,
+        length=length,
+        end_finishes=end_finishes,
+        mode=Mode.PRIVATE,
+    )
+
+
+@part_builder
 def _cord_insert(shared: _Shared, params: CordInsertParams) -> Result:
     with BuildPart() as part:
-        thread.IsoThread(
-            major_diameter=params.thread_d,
-            pitch=params.thread_pitch,
-            length=params.insert_distance,
-            end_finishes=("square", "chamfer"),
+        add(
+            _iso_thread(
+                params.thread_d,
+                params.thread_pitch,
+                params.insert_distance,
+                ("square", "chamfer"),
+            )
         )
 
         with BuildSketch() as insert_sk:
@@ -170,6 +196,7 @@ def _cord_insert(shared: _Shared, params: CordInsertParams) -> Result:
     return Result(name="cord_insert", part=part.part, locals=locals())
 
 
+@part_builder
 def _shroud_plate(params: ShroudPlateParams) -> Result:
     width_upper = params.width_upper
     width_lower = params.width_lower
@@ -211,6 +238,7 @@ def _shroud_plate(params: ShroudPlateParams) -> Result:
     return Result(name="shroud_plate", part=part.part, locals=locals())
 
 
+@part_builder
 def _driver_plate(shared: _Shared, params: DriverParams) -> Result:
     total_width = params.width + params.mount_overhang_y * 2
     total_length = params.mount + params.mount_overhang_x * 2
@@ -247,6 +275,7 @@ def _driver_plate(shared: _Shared, params: DriverParams) -> Result:
     return Result(name="driver_plate", part=plate.part, locals=locals())
 
 
+@part_builder
 def _ring(shared: _Shared, params: RingParams) -> Result:
     center_d = params.center_d
     ring_thickness = params.width
@@ -335,6 +364,7 @@ def _ring(shared: _Shared, params: RingParams) -> Result:
     return Result(name="ring", part=ring.part, locals=locals())
 
 
+@part_builder
 def _bracket(ring: RingParams, params: BracketParams) -> Result:
     bracket_d = params.bulb_d + params.bulb_padding
     bracket_total_height = params.width + params.thickness * 2
@@ -383,12 +413,12 @@ def _bracket(ring: RingParams, params: BracketParams) -> Result:
     return Result(name="bracket", part=bracket.part, locals=locals())
 
 
-def main(params: Params) -> list[Result]:
-    return [
-        _ring(params, params.ring),
-        _bracket(params.ring, params.bracket),
-        _driver_plate(params, params.driver),
-        _shroud_plate(params.shroud),
-        _cord_insert(params, params.cord_insert),
-        _cord_end_cover(params.cord_insert, params.cord_end_cover),
-    ]
+def main(params: Params) -> Iterator[Result]:
+    # yielded one at a time, so that each part can be exported and released
+    # before the next is built
+    yield _ring(params, params.ring)
+    yield _bracket(params.ring, params.bracket)
+    yield _driver_plate(params, params.driver)
+    yield _shroud_plate(params.shroud)
+    yield _cord_insert(params, params.cord_insert)
+    yield _cord_end_cover(params.cord_insert, params.cord_end_cover)
@@ -35,6 +35,22 @@ class Params(ParamsBase):
     bottom_top_offset: float = 0
     cutout_r: float = 7
 
+    def validate(self) -> None:
+        super().validate()
+        if min(self.interior_width, self.interior_depth, self.interior_height) <= 0:
+            raise ValueError("interior dimensions must be positive")
+        if self.thickness <= 0:
+            raise ValueError("thickness must be positive")
+        if min(self.interior_fillet_r, self.corner_fillet_r, self.fit) < 0:
+            raise ValueError("fillets and fit may not be negative")
+        if self.corner_fillet_r >= min(self.interior_width, self.interior_depth) / 2:
+            raise ValueError(
+                "corner_fillet_r must be less than half of interior_width and "
+                "interior_depth"
+            )
+        if self.bottom_top_offset >= self.interior_height:
+            raise ValueError("bottom_top_offset must be less than interior_height")
+
 
 def _build_body(
     *,
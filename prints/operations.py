@@ -0,0 +1,59 @@
+from collections.abc import Iterable
+
+from build123d import BuildPart, Compound, Mode, Part, Shape, add
+from OCP.BRepAlgoAPI import BRepAlgoAPI_Cut
+from OCP.TopTools import TopTools_ListOfShape
+
+
+def pattern_cut(
+    tools: Shape | Iterable[Shape],
+    *,
+    part: Part | None = None,
+    parallel: bool = False,
+) -> Part:
+    """
+    Subtract every one of ``tools`` from a part using a single boolean.
+
+    Patterned features (hole grids, a screw hole per face) would otherwise be
+    cut one boolean at a time, with each cut re-intersecting the whole part.
+    Every solid of the tools is instead passed as a separate tool of a single
+    cut, rather than nested in one compound, which OCC handles much more slowly;
+    ``parallel`` enables OCC's parallel boolean mode.
+
+    When ``part`` is not given, the tools are cut from the active ``BuildPart``,
+    and its part is replaced by the result.
+    """
+    context: BuildPart | None = None
+    if part is None:
+        context = BuildPart._get_context("pattern_cut")
+        if context is None or context.part is None:
+            raise RuntimeError("pattern_cut requires a part, or an active BuildPart")
+        part = context.part
+
+    if isinstance(tools, Shape):
+        tools = [tools]
+
+    args = TopTools_ListOfShape()
+    args.Append(part.wrapped)
+    tool_args = TopTools_ListOfShape()
+    for tool in tools:
+        # unpack compounds, so every solid is a tool of the same operation
+        # rather than one nested compound, which OCC handles much more slowly
+        for solid in tool.solids():
+            tool_args.Append(solid.wrapped)
+
+    op = BRepAlgoAPI_Cut()
+    op.SetArguments(args)
+    op.SetTools(tool_args)
+    op.SetRunParallel(parallel)
+    op.Build()
+    if not op.IsDone():
+        raise RuntimeError("pattern_cut failed to compute the boolean")
+
+    cut = Compound.cast(op.Shape()).clean()
+    result = Part(cut.wrapped) if isinstance(cut, Compound) else Part([cut])
+
+    if context is not None:
+        add(result, mode=Mode.REPLACE)
+
+    return result
@@ -1,15 +1,31 @@
+import copy
 from collections import ChainMap
 from dataclasses import dataclass
-from typing import Any, get_type_hints, override
+from typing import Any, Self, get_type_hints, override
 
 from build123d import Part
 
+from .mesh import MESH_ANGULAR_TOLERANCE, MESH_TOLERANCE, Mesh, shape_mesh
+
 
 @dataclass
 class Result:
     part: Part
     locals: Any
     name: str | None = None
+    # flattened names of the parameters read to build the part, when traced
+    reads: frozenset[str] | None = None
+
+    def mesh(
+        self,
+        tolerance: float = MESH_TOLERANCE,
+        angular_tolerance: float = MESH_ANGULAR_TOLERANCE,
+    ) -> Mesh:
+        """
+        Tessellate the part, returning its vertices and triangles as NumPy
+        arrays; see ``prints.mesh.shape_mesh``.
+        """
+        return shape_mesh(self.part, tolerance, angular_tolerance)
 
 
 class ParamsBase:
@@ -20,6 +36,38 @@ class ParamsBase:
     def _dict(self) -> dict[str, Any]:
         return {key: getattr(self, key) for key in self._annotations().keys()}
 
+    @classmethod
+    def defaults(cls) -> Self:
+        """
+        Create an instance with the default values, whose nested parameters are
+        copies of their defaults, so that overriding them leaves the defaults,
+        which are shared by every instance, untouched.
+        """
+        params = cls()
+        params._copy_nested()
+        return params
+
+    def _copy_nested(self) -> None:
+        for key, cls in self._annotations().items():
+            if isinstance(cls, type) and issubclass(cls, ParamsBase):
+                nested = copy.copy(getattr(self, key))
+                nested._copy_nested()
+                # nested parameters may be frozen dataclasses
+                object.__setattr__(self, key, nested)
+
+    def validate(self) -> None:
+        """
+        Check the parameters for values the model can't be built from, raising
+        ``ValueError`` if any are found. Nested parameters are validated too.
+
+        Subclasses may override this to add their own constraints, which should
+        be cheap to check; call ``super().validate()`` to keep validating any
+        nested parameters.
+        """
+        for value in self._dict().values():
+            if isinstance(value, ParamsBase):
+                value.validate()
+
 
 @dataclass(frozen=True)
 class ThreadedInsert(ParamsBase):
@@ -0,0 +1,60 @@
+"""
+Named sets of parameter overrides, such as the standard sizes of a model.
+
+A module's presets are kept beside it, in a TOML file of the same name with a
+``.presets.toml`` extension. Each table of the file is a preset, holding
+overrides in the same form as a job's ``params``; nested params are nested
+tables::
+
+    [small]
+    interior_width = 30
+    interior_depth = 15
+
+A params file holds a single set of overrides, in the same form.
+"""
+
+import os
+import tomllib
+from types import ModuleType
+from typing import Any
+
+from .utils import flatten_overrides, override_args
+
+PRESETS_EXT = ".presets.toml"
+
+
+def presets_path(mod: ModuleType) -> str:
+    assert mod.__file__
+    return f"{os.path.splitext(mod.__file__)[0]}{PRESETS_EXT}"
+
+
+def load_presets(mod: ModuleType) -> dict[str, dict[str, Any]]:
+    """
+    The module's presets, by name; empty when it has none.
+    """
+    try:
+        with open(presets_path(mod), "rb") as f:
+            return tomllib.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def preset_args(mod: ModuleType, name: str) -> list[str]:
+    """
+    The overrides of the module's preset ``name``, as they would be given on the
+    command line.
+    """
+    presets = load_presets(mod)
+    if name not in presets:
+        available = ", ".join(sorted(presets)) or "none"
+        raise ValueError(f"unknown preset {name!r}; available presets: {available}")
+    return override_args(flatten_overrides(presets[name]))
+
+
+def params_file_args(path: str) -> list[str]:
+    """
+    The overrides in the params file at ``path``, as they would be given on the
+    command line.
+    """
+    with open(path, "rb") as f:
+        return override_args(flatten_overrides(tomllib.load(f)))
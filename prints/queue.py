@@ -0,0 +1,223 @@
+"""
+A job queue kept in a directory, for spreading export jobs across machines which
+share a filesystem.
+
+Jobs are added to ``pending/`` by ``enqueue``. Each worker claims a job by
+renaming it into ``claimed/``, which succeeds for only one of them; when the job
+finishes, its record (as in the ``run`` manifest) is written to ``done/`` or
+``failed/``, and its output to ``logs/``::
+
+    prints enqueue --queue /mnt/queue sweep.toml
+    prints worker --queue /mnt/queue --once
+
+Output paths are resolved when the job is enqueued, so they should be on the
+shared filesystem too.
+
+A claim is a lease: the worker touches the claimed job while running it, and a
+job left untouched for longer than the lease, as when its worker was killed, is
+returned to ``pending/`` for another worker to claim.
+"""
+
+import contextlib
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from typing import Any
+
+from .jobs import Job, JobResult, fingerprint, result_record, run_job
+
+STATES = ("pending", "claimed", "done", "failed", "logs")
+# seconds a claimed job may go untouched before it's returned to pending
+DEFAULT_LEASE = 600
+# times a lease is renewed within its length, so that a slow filesystem or a
+# busy worker doesn't let it lapse
+RENEWALS = 4
+
+
+def _path(queue: str, state: str, job_fingerprint: str, ext: str = ".json") -> str:
+    return os.path.join(queue, state, f"{job_fingerprint}{ext}")
+
+
+def _write_json(path: str, value: dict[str, Any]) -> None:
+    # write beside the destination first, so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(value, f)
+    os.replace(tmp_path, path)
+
+
+def init_queue(queue: str) -> None:
+    for state in STATES:
+        os.makedirs(os.path.join(queue, state), exist_ok=True)
+
+
+def enqueue(queue: str, jobs: list[Job]) -> list[str]:
+    """
+    Add ``jobs`` to the ``queue``, returning the fingerprints of those added.
+
+    Jobs with invalid parameters are skipped. Jobs which are already pending,
+    claimed or done are not added again; failed jobs are.
+    """
+    init_queue(queue)
+
+    added = []
+    for job in jobs:
+        try:
+            job_fingerprint = fingerprint(job)
+        except ValueError as e:
+            print(f"skipping invalid job: {job.module} {job.raw_params()}: {e}")
+            continue
+        if any(
+            os.path.exists(_path(queue, state, job_fingerprint))
+            for state in ("pending", "claimed", "done")
+        ):
+            print(f"skipping queued job: {job.module} {job.raw_params()}")
+            continue
+
+        _write_json(_path(queue, "pending", job_fingerprint), asdict(job))
+        added.append(job_fingerprint)
+
+    return added
+
+
+def requeue_expired(queue: str, lease: float = DEFAULT_LEASE) -> list[str]:
+    """
+    Return claimed jobs untouched for longer than ``lease`` seconds to pending,
+    returning their fingerprints.
+    """
+    requeued = []
+    expired = time.time() - lease
+    for entry in os.scandir(os.path.join(queue, "claimed")):
+        if not entry.name.endswith(".json"):
+            continue
+        job_fingerprint = entry.name.removesuffix(".json")
+        try:
+            if entry.stat().st_mtime >= expired:
+                continue
+            os.rename(entry.path, _path(queue, "pending", job_fingerprint))
+        except FileNotFoundError:
+            # finished, or requeued by another worker first
+            continue
+        print(f"requeued expired job: {job_fingerprint[:10]}")
+        requeued.append(job_fingerprint)
+
+    return requeued
+
+
+def claim(queue: str, lease: float = DEFAULT_LEASE) -> tuple[str, Job] | None:
+    """
+    Claim the oldest pending job in the ``queue``, if any remain, after
+    returning expired claims to pending.
+    """
+    requeue_expired(queue, lease)
+
+    pending = os.path.join(queue, "pending")
+    entries = [e for e in os.scandir(pending) if e.name.endswith(".json")]
+    for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+        job_fingerprint = entry.name.removesuffix(".json")
+        claimed = _path(queue, "claimed", job_fingerprint)
+        try:
+            # the lease starts now; renaming keeps the time it was enqueued
+            os.utime(entry.path)
+            os.rename(entry.path, claimed)
+        except FileNotFoundError:
+            # claimed by another worker first
+            continue
+
+        with open(claimed) as f:
+            spec = json.load(f)
+        spec["types"] = tuple(spec["types"])
+        spec["only"] = tuple(spec["only"])
+        spec["copies"] = tuple(spec["copies"])
+        return job_fingerprint, Job(**spec)
+
+    return None
+
+
+def _renew(claimed: str, interval: float, stop: threading.Event) -> None:
+    while not stop.wait(interval):
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(claimed)
+
+
+def work(
+    queue: str, job_fingerprint: str, job: Job, lease: float = DEFAULT_LEASE
+) -> JobResult:
+    """
+    Run a claimed job, recording its result and log in the ``queue``, and
+    renewing its lease until it finishes. An interrupted job is returned to
+    pending.
+    """
+    claimed = _path(queue, "claimed", job_fingerprint)
+    stop = threading.Event()
+    renewer = threading.Thread(
+        target=_renew, args=(claimed, lease / RENEWALS, stop), daemon=True
+    )
+    renewer.start()
+
+    log_path = _path(queue, "logs", job_fingerprint, ".log")
+    try:
+        with (
+            open(log_path, "w") as log,
+            contextlib.redirect_stdout(log),
+            contextlib.redirect_stderr(log),
+        ):
+            result = run_job(job, job_fingerprint)
+            if result.error:
+                print(result.error)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.rename(claimed, _path(queue, "pending", job_fingerprint))
+        raise
+    finally:
+        stop.set()
+        renewer.join()
+
+    record = {
+        **result_record(result),
+        "error": result.error,
+        "worker": f"{socket.gethostname()}:{os.getpid()}",
+    }
+    state = "failed" if result.error else "done"
+    _write_json(_path(queue, state, job_fingerprint), record)
+    with contextlib.suppress(FileNotFoundError):
+        # requeued, if its lease lapsed
+        os.remove(claimed)
+
+    return result
+
+
+def run_worker(
+    queue: str,
+    *,
+    once: bool = False,
+    poll: float = 5,
+    lease: float = DEFAULT_LEASE,
+) -> list[JobResult]:
+    """
+    Run jobs from the ``queue`` until interrupted, checking for new jobs every
+    ``poll`` seconds; with ``once``, stop as soon as the queue is empty, and
+    return the results of the jobs run. Without it, results are only recorded
+    in the queue, so that a long-running worker doesn't accumulate them.
+    """
+    init_queue(queue)
+
+    results = []
+    while True:
+        claimed = claim(queue, lease)
+        if claimed is None:
+            if once:
+                return results
+            time.sleep(poll)
+            continue
+
+        job_fingerprint, job = claimed
+        result = work(queue, job_fingerprint, job, lease)
+        status = "failed" if result.error else "ok"
+        print(f"{status:<7}  {job.module:<24}  {job_fingerprint[:10]}")
+        if once:
+            results.append(result)
@@ -0,0 +1,186 @@
+"""
+PNG thumbnails of parts, rendered on the CPU with NumPy; no GPU or display is
+needed, so they can be made in CI.
+
+A part's triangles are seen from above, at its front right corner, with an
+orthographic projection fitted to the image. Each triangle is flat shaded by a
+fixed light, and drawn through a z-buffer. Triangles are rasterized in batches:
+every pixel within a triangle's bounds is tested at once, and the nearest
+triangle of each pixel is kept. Edges are smoothed by rendering at a multiple of
+the size, then averaging; the background is transparent.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+from .mesh import Mesh
+
+THUMBNAIL_SIZE = 256
+# tessellation of each part; thumbnails are small, so it can be coarse
+THUMBNAIL_TOLERANCE = 0.05
+THUMBNAIL_ANGULAR_TOLERANCE = 0.3
+# samples per pixel, along each axis
+SUPERSAMPLE = 2
+# space around the part, as a fraction of the size
+MARGIN = 0.05
+# the direction the part is seen from, in its coordinates
+VIEW_DIRECTION = (1, -1, 1)
+# the direction light comes from, in view coordinates: right, up and towards the
+# viewer
+LIGHT_DIRECTION = (-0.5, 1, 0.7)
+# the shade of faces turned away from the light
+AMBIENT = 0.3
+PART_COLOR = (70, 130, 200)
+# pixel tests per batch of triangles, bounding memory use
+BATCH_SIZE = 1 << 22
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# 8 bits per channel, RGBA
+PNG_BIT_DEPTH = 8
+PNG_COLOR_TYPE = 6
+
+
+def _unit(v: tuple[float, ...] | np.ndarray) -> np.ndarray:
+    v = np.asarray(v, dtype=np.float64)
+    return v / np.linalg.norm(v)
+
+
+def _view() -> np.ndarray:
+    # rows are the view's right, up and towards the viewer, in part coordinates
+    toward = _unit(VIEW_DIRECTION)
+    right = _unit(np.cross([0, 0, 1], toward))
+    return np.array([right, np.cross(toward, right), toward])
+
+
+def render(mesh: Mesh, size: int = THUMBNAIL_SIZE) -> np.ndarray:
+    """
+    Render ``mesh`` as a (size, size, 4) array of RGBA bytes.
+    """
+    vertices, indices = mesh
+    full = size * SUPERSAMPLE
+    depth = np.full(full * full, -np.inf)
+    shade = np.zeros(full * full)
+
+    if len(indices):
+        points = vertices @ _view().T
+        low, high = points.min(axis=0), points.max(axis=0)
+        extent = (high - low)[:2].max()
+        scale = full * (1 - 2 * MARGIN) / extent if extent > 0 else 1
+        # centered on the image, in pixels, with y up
+        points = (points - (low + high) / 2) * scale + [full / 2, full / 2, 0]
+        triangles = points[indices]
+
+        a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+        normals = np.cross(b - a, c - a)
+        # twice each triangle's area on screen; those facing away, or seen edge
+        # on, are never visible
+        areas = normals[:, 2]
+        visible = areas > 0
+        triangles, normals, areas = triangles[visible], normals[visible], areas[visible]
+        light = _unit(LIGHT_DIRECTION)
+        brightness = np.maximum(normals @ light / np.linalg.norm(normals, axis=1), 0)
+        shades = AMBIENT + (1 - AMBIENT) * brightness
+
+        # the pixels, by their centers, within each triangle's bounds
+        x0 = np.clip(np.ceil(triangles[:, :, 0].min(axis=1) - 0.5), 0, full)
+        x1 = np.clip(np.floor(triangles[:, :, 0].max(axis=1) - 0.5), -1, full - 1)
+        y0 = np.clip(np.ceil(triangles[:, :, 1].min(axis=1) - 0.5), 0, full)
+        y1 = np.clip(np.floor(triangles[:, :, 1].max(axis=1) - 0.5), -1, full - 1)
+        widths = np.maximum(x1 - x0 + 1, 0).astype(np.int64)
+        counts = widths * np.maximum(y1 - y0 + 1, 0).astype(np.int64)
+        ends = np.cumsum(counts)
+
+        start = 0
+        while start < len(triangles):
+            # as many triangles as fit in a batch, and at least one
+            stop = max(
+                int(
+                    np.searchsorted(
+                        ends, ends[start] - counts[start] + BATCH_SIZE, "right"
+                    )
+                ),
+                start + 1,
+            )
+            batch = np.arange(start, stop)
+            start = stop
+
+            owners = np.repeat(batch, counts[batch])
+            if not len(owners):
+                continue
+            offsets = np.arange(len(owners)) - np.repeat(
+                ends[batch] - counts[batch] - (ends[batch[0]] - counts[batch[0]]),
+                counts[batch],
+            )
+            px = x0[owners] + offsets % widths[owners]
+            py = y0[owners] + offsets // widths[owners]
+
+            # the barycentric weights of each pixel's center
+            t = triangles[owners]
+            cx, cy = px + 0.5, py + 0.5
+
+            def edge(i: int, j: int) -> np.ndarray:
+                return (t[:, j, 0] - t[:, i, 0]) * (cy - t[:, i, 1]) - (
+                    t[:, j, 1] - t[:, i, 1]
+                ) * (cx - t[:, i, 0])
+
+            w0, w1, w2 = edge(1, 2), edge(2, 0), edge(0, 1)
+            inside = (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
+            owners, px, py, t = owners[inside], px[inside], py[inside], t[inside]
+            z = (
+                w0[inside] * t[:, 0, 2]
+                + w1[inside] * t[:, 1, 2]
+                + w2[inside] * t[:, 2, 2]
+            ) / areas[owners]
+
+            # the nearest triangle at each pixel, against those drawn before
+            pixels = ((full - 1 - py) * full + px).astype(np.int64)
+            order = np.lexsort((-z, pixels))
+            _, first = np.unique(pixels[order], return_index=True)
+            nearest = order[first]
+            pixels, z = pixels[nearest], z[nearest]
+            closer = z > depth[pixels]
+            depth[pixels[closer]] = z[closer]
+            shade[pixels[closer]] = shades[owners[nearest][closer]]
+
+    covered = np.isfinite(depth).reshape(size, SUPERSAMPLE, size, SUPERSAMPLE)
+    samples = covered.sum(axis=(1, 3))
+    total = shade.reshape(size, SUPERSAMPLE, size, SUPERSAMPLE).sum(axis=(1, 3))
+    image = np.zeros((size, size, 4))
+    image[..., :3] = (total / np.maximum(samples, 1))[..., None] * PART_COLOR
+    image[..., 3] = samples / SUPERSAMPLE**2 * 255
+    return np.rint(image).astype(np.uint8)
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    body = kind + data
+    return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """
+    Encode an (h, w, 4) array of RGBA bytes as a PNG.
+    """
+    height, width, _ = image.shape
+    header = struct.pack(
+        ">IIBBBBB", width, height, PNG_BIT_DEPTH, PNG_COLOR_TYPE, 0, 0, 0
+    )
+    # each row is prefixed by its filter type; none
+    rows = np.zeros((height, width * 4 + 1), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(height, -1)
+    return b"".join(
+        [
+            PNG_SIGNATURE,
+            _chunk(b"IHDR", header),
+            _chunk(b"IDAT", zlib.compress(rows.tobytes(), 9)),
+            _chunk(b"IEND", b""),
+        ]
+    )
+
+
+def thumbnail(mesh: Mesh, size: int = THUMBNAIL_SIZE) -> bytes:
+    """
+    Render ``mesh`` as a PNG.
+    """
+    return encode_png(render(mesh, size))
@@ -0,0 +1,205 @@
+from collections.abc import Hashable, Iterable
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from build123d import (
+    Axis,
+    BoundBox,
+    BuildPart,
+    Builder,
+    GeomType,
+    Location,
+    Plane,
+    Shape,
+    ShapeList,
+    Vector,
+)
+from OCP.BRepGProp import BRepGProp_Face
+from OCP.BRepTools import BRepTools
+from OCP.gp import gp_Dir, gp_Pnt, gp_Vec
+from OCP.TopoDS import TopoDS_Edge, TopoDS_Face
+
+# the index of each builder's current part, replaced when the part changes
+_indexes: WeakKeyDictionary[Builder, "TopologyIndex"] = WeakKeyDictionary()
+
+
+def _axis_key(axis: Axis) -> tuple[Hashable, ...]:
+    return (axis.position.to_tuple(), axis.direction.to_tuple())
+
+
+class IndexedShapeList(ShapeList):
+    """
+    A ``ShapeList`` whose ``sort_by`` and ``filter_by`` queries by ``Axis``,
+    ``Plane`` or ``GeomType`` are answered from a ``TopologyIndex``, and
+    memoized there. Other queries fall back to ``ShapeList``.
+    """
+
+    def __init__(self, iterable: Iterable[Any], index: "TopologyIndex"):
+        super().__init__(iterable)
+        self.index = index
+
+    def __getitem__(self, key):
+        item = super().__getitem__(key)
+        if isinstance(key, slice):
+            return IndexedShapeList(item, self.index)
+        return item
+
+    def _memoize(self, query: tuple[Hashable, ...], compute) -> "IndexedShapeList":
+        key = (tuple(id(s) for s in self), *query)
+        if (result := self.index._queries.get(key)) is None:
+            result = self.index._queries[key] = list(compute())
+        # a new list each time, so callers can't modify the memoized one
+        return IndexedShapeList(result, self.index)
+
+    def sort_by(self, sort_by=Axis.Z, reverse: bool = False) -> ShapeList:
+        if not isinstance(sort_by, Axis):
+            return IndexedShapeList(super().sort_by(sort_by, reverse), self.index)
+
+        # computed just as ``ShapeList.sort_by`` does, so ties sort identically
+        assert sort_by.location is not None
+        axis_as_location = sort_by.location.inverse()
+
+        def compute():
+            return sorted(
+                self,
+                key=lambda s: (
+                    axis_as_location * Location(self.index.center(s))
+                ).position.Z,
+                reverse=reverse,
+            )
+
+        return self._memoize(("sort", _axis_key(sort_by), reverse), compute)
+
+    def filter_by(
+        self, filter_by, reverse: bool = False, tolerance: float = 1e-5
+    ) -> ShapeList:
+        if isinstance(filter_by, GeomType):
+            query = ("geom_type", filter_by)
+
+            def predicate(s):
+                return self.index.geom_type(s) == filter_by
+
+        elif isinstance(filter_by, Axis):
+            query = ("axis", _axis_key(filter_by))
+
+            def predicate(s):
+                axis = self.index.axis(s)
+                return axis is not None and filter_by.is_parallel(axis, tolerance)
+
+        elif isinstance(filter_by, Plane) and all(
+            isinstance(s.wrapped, TopoDS_Face) for s in self
+        ):
+            # faces only; edges parallel to a plane need their curves checked
+            plane_axis = Axis(filter_by.origin, filter_by.z_dir)
+            query = ("plane", _axis_key(plane_axis))
+
+            def predicate(s):
+                axis = self.index.axis(s)
+                return axis is not None and plane_axis.is_parallel(axis, tolerance)
+
+        else:
+            return IndexedShapeList(
+                super().filter_by(filter_by, reverse, tolerance), self.index
+            )
+
+        def compute():
+            return (s for s in self if predicate(s) != reverse)
+
+        return self._memoize((*query, reverse, tolerance), compute)
+
+
+class TopologyIndex:
+    """
+    An index of a shape's faces, edges and vertices, which keeps the centers,
+    normals, directions and bounding boxes used to answer ``sort_by`` and
+    ``filter_by`` queries, so that repeated queries of an unchanged shape don't
+    recompute them. Each is computed the first time it's needed.
+
+    Use ``topology`` to get the index of a builder's current part.
+    """
+
+    def __init__(self, shape: Shape):
+        self.shape = shape
+        self._lists: dict[str, IndexedShapeList] = {}
+        self._centers: dict[int, Vector] = {}
+        self._axes: dict[int, Axis | None] = {}
+        self._geom_types: dict[int, GeomType] = {}
+        self._boxes: dict[int, BoundBox] = {}
+        self._queries: dict[tuple[Hashable, ...], list[Shape]] = {}
+
+    def _list(self, kind: str) -> IndexedShapeList:
+        if kind not in self._lists:
+            self._lists[kind] = IndexedShapeList(getattr(self.shape, kind)(), self)
+        # the index keeps the shapes alive, so their ids remain unique
+        return IndexedShapeList(self._lists[kind], self)
+
+    def faces(self) -> IndexedShapeList:
+        return self._list("faces")
+
+    def edges(self) -> IndexedShapeList:
+        return self._list("edges")
+
+    def vertices(self) -> IndexedShapeList:
+        return self._list("vertices")
+
+    def center(self, shape: Shape) -> Vector:
+        if (center := self._centers.get(id(shape))) is None:
+            center = self._centers[id(shape)] = shape.center()
+        return center
+
+    def geom_type(self, shape: Shape) -> GeomType:
+        if (geom_type := self._geom_types.get(id(shape))) is None:
+            geom_type = self._geom_types[id(shape)] = shape.geom_type
+        return geom_type
+
+    def bounding_box(self, shape: Shape) -> BoundBox:
+        if (box := self._boxes.get(id(shape))) is None:
+            box = self._boxes[id(shape)] = shape.bounding_box()
+        return box
+
+    def axis(self, shape: Shape) -> Axis | None:
+        """
+        The normal of a planar face, or the direction of a linear edge, as
+        ``ShapeList.filter_by`` finds them; ``None`` for any other shape.
+        """
+        if id(shape) in self._axes:
+            return self._axes[id(shape)]
+
+        axis = None
+        if shape.is_planar_face:
+            pnt, normal = gp_Pnt(), gp_Vec()
+            u_val, _, v_val, _ = BRepTools.UVBounds_s(shape.wrapped)
+            BRepGProp_Face(shape.wrapped).Normal(u_val, v_val, pnt, normal)
+            axis = Axis(self.center(shape), Vector(normal).normalized())
+        elif (
+            isinstance(shape.wrapped, TopoDS_Edge)
+            and self.geom_type(shape) == GeomType.LINE
+        ):
+            curve = shape.geom_adaptor()
+            pnt, tangent = gp_Pnt(), gp_Vec()
+            curve.D1(curve.FirstParameter(), pnt, tangent)
+            axis = Axis(Vector(pnt), Vector(gp_Dir(tangent)))
+
+        self._axes[id(shape)] = axis
+        return axis
+
+
+def topology(obj: Builder | Shape | None = None) -> TopologyIndex:
+    """
+    Get the ``TopologyIndex`` of a builder's current part, or of a shape.
+
+    A builder's index is kept until its part changes, when a new one is created,
+    so queries made between two operations share it. When ``obj`` isn't given,
+    the active ``BuildPart`` is used.
+    """
+    if obj is None:
+        obj = BuildPart._get_context("topology")
+        if obj is None:
+            raise RuntimeError("topology requires a shape, or an active BuildPart")
+    if isinstance(obj, Shape):
+        return TopologyIndex(obj)
+
+    index = _indexes.get(obj)
+    if index is None or index.shape is not obj._obj:
+        index = _indexes[obj] = TopologyIndex(obj._obj)
+    return index
@@ -1,3 +1,4 @@
+import hashlib
 from collections.abc import Mapping
 from dataclasses import fields
 from inspect import Parameter, signature
@@ -85,3 +86,41 @@ def flatten_params(params: ParamsBase) -> dict[str, Primitive]:
     accumulator = {}
     _flatten_params(params, accumulator, [])
     return accumulator
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def flatten_overrides(
+    overrides: Mapping[str, Any], prefix: str = ""
+) -> dict[str, Primitive]:
+    """
+    Flatten nested tables of parameter overrides, as read from TOML, to their
+    dotted parameter names.
+    """
+    flat = {}
+    for k, v in overrides.items():
+        if isinstance(v, Mapping):
+            flat.update(flatten_overrides(v, f"{prefix}{k}."))
+        elif is_primitive(v):
+            flat[f"{prefix}{k}"] = v
+        else:
+            raise ValueError(f"override ``{prefix}{k}`` is not a primitive")
+    return flat
+
+
+def override_args(overrides: Mapping[str, Primitive]) -> list[str]:
+    """
+    Parameter overrides, by dotted name, as they would be given on the command
+    line.
+    """
+    raw = []
+    for k, v in overrides.items():
+        name = k.replace(".", "_")
+        if isinstance(v, bool):
+            raw.append(f"--{name}" if v else f"--no-{name}")
+        else:
+            raw.extend([f"--{name}", str(v)])
+    return raw
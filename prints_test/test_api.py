@@ -0,0 +1,86 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+import pytest
+
+from prints import api, build, export
+from prints.models import led_ring, telescoping_box
+
+
+class TestMakeParams(TestCase):
+    def test_overrides(self):
+        params = api.make_params(
+            "led_ring", {"ring": {"segments": 4}, "driver.width": 50}
+        )
+
+        assert params.ring.segments == 4
+        assert params.driver.width == 50
+        # the shared defaults are left untouched
+        assert led_ring.Params().ring.segments == 3
+
+    def test_params_instance(self):
+        params = telescoping_box.Params()
+        params.fit = 0.25
+
+        assert api.make_params("telescoping_box", params).fit == 0.25
+
+        with pytest.raises(ValueError, match="telescoping_box.Params"):
+            api.make_params("telescoping_box", led_ring.Params())
+
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="unknown param ``lid``"):
+            api.make_params("telescoping_box", {"lid": 1})
+
+        with pytest.raises(ValueError, match="unknown param ``ring``"):
+            api.make_params("led_ring", {"ring": 1})
+
+        with pytest.raises(ValueError, match="must be a bool"):
+            api.make_params("telescoping_box", {"top_interior_fillet": 1})
+
+        with pytest.raises(ValueError, match="``ring.segments`` must be an int"):
+            api.make_params("led_ring", {"ring.segments": 3.9})
+
+        with pytest.raises(ValueError, match="``ring.segments`` must be an int"):
+            api.make_params("led_ring", {"ring.segments": True})
+
+        # integral floats are exact
+        assert api.make_params("led_ring", {"ring.segments": 4.0}).ring.segments == 4
+
+        with pytest.raises(ValueError, match="thickness must be positive"):
+            api.make_params("telescoping_box", {"thickness": 0})
+
+        with pytest.raises(ValueError, match="invalid module name"):
+            api.make_params("_benchmaster")
+
+    def test_modules_cached(self):
+        api._load_module.cache_clear()
+        with mock.patch("prints.cli.check_module") as check_module:
+            api.make_params("telescoping_box")
+            api.make_params("telescoping_box", {"fit": 0.2})
+
+        assert check_module.call_count == 1
+        api._load_module.cache_clear()
+
+
+class TestBuild(TestCase):
+    def test_build(self):
+        [top] = build("telescoping_box", {"interior_width": 30}, only=["top"])
+
+        assert top.name == "top"
+        assert top.part.bounding_box().size.X == pytest.approx(30 + 4 * 0.75 + 0.3)
+
+    def test_export(self):
+        with tempfile.TemporaryDirectory() as directory:
+            outputs = export(
+                "telescoping_box",
+                {"fit": 0.25},
+                out=f"{directory}/",
+                type="stl",
+                only=["bottom"],
+            )
+
+            assert outputs == [
+                os.path.join(directory, "telescoping_box-bottom-fit=0.25.stl")
+            ]
+            assert os.path.exists(outputs[0])
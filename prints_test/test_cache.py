@@ -0,0 +1,194 @@
+import os
+import tempfile
+import time
+from unittest import TestCase, mock
+
+import pytest
+from build123d import Box, Part
+
+from prints.cache import (
+    CACHE_DIR_ENV,
+    CACHE_SIZE_ENV,
+    artifact_key,
+    cache_key,
+    cached_shape,
+    evict,
+    evict_cache,
+    imported_modules,
+    module_digest,
+)
+from prints.params import ParamsBase
+
+
+class BoxParams(ParamsBase):
+    size: float = 10
+
+
+class TestCachedShape(TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.dict(os.environ, {CACHE_DIR_ENV: self._dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._dir.cleanup)
+
+    def test_memoizes(self):
+        calls = []
+
+        @cached_shape
+        def box(params: BoxParams) -> Part:
+            calls.append(params.size)
+            return Part() + Box(params.size, params.size, params.size)
+
+        first = box(BoxParams())
+        second = box(BoxParams())
+
+        assert calls == [10]
+        assert first.volume == pytest.approx(1000)
+        assert second.volume == pytest.approx(1000)
+        assert first is not second
+
+    def test_reads_from_disk(self):
+        calls = []
+
+        def box(size: float) -> Part:
+            calls.append(size)
+            return Part() + Box(size, size, size)
+
+        # decorate twice, so the second wrapper has an empty in-memory cache
+        cached_shape(box)(5)
+        result = cached_shape(box)(5)
+
+        assert calls == [5]
+        assert isinstance(result, Part)
+        assert result.volume == pytest.approx(125)
+
+    def test_disk_cache_disabled(self):
+        calls = []
+
+        def box(size: float) -> Part:
+            calls.append(size)
+            return Part() + Box(size, size, size)
+
+        with mock.patch.dict(os.environ, {CACHE_SIZE_ENV: "0"}):
+            cached_shape(box)(5)
+            cached_shape(box)(5)
+
+        assert calls == [5, 5]
+
+    def test_copies_are_independent(self):
+        @cached_shape
+        def box(size: float) -> Part:
+            return Part() + Box(size, size, size)
+
+        moved = box(2)
+        moved.position = (10, 0, 0)
+
+        assert box(2).position.X == 0
+
+    def test_copies_share_no_sub_shapes(self):
+        @cached_shape
+        def box(size: float) -> Part:
+            return Part() + Box(size, size, size)
+
+        first, second = box(2), box(2)
+
+        assert not first.wrapped.IsPartner(second.wrapped)
+        for a, b in zip(first.faces(), second.faces()):
+            assert not a.wrapped.IsPartner(b.wrapped)
+
+
+class TestCacheKey(TestCase):
+    def test_params(self):
+        def fn(params: BoxParams) -> None:
+            pass
+
+        changed = BoxParams()
+        changed.size = 11
+
+        assert cache_key(fn, BoxParams()) == cache_key(fn, BoxParams())
+        assert cache_key(fn, BoxParams()) != cache_key(fn, changed)
+
+    def test_unsupported(self):
+        def fn(value: object) -> None:
+            pass
+
+        with pytest.raises(TypeError, match="cannot cache on a value of type"):
+            cache_key(fn, object())
+
+
+class TestModuleDigest(TestCase):
+    def test_imported_modules(self):
+        dowel = imported_modules("prints.models.roll_spool_dowel")
+        led_ring = imported_modules("prints.models.led_ring")
+
+        # through relative imports, and the modules they import in turn
+        assert "prints.models.roll_spool_holder" in dowel
+        assert "prints.models._benchmaster" in dowel
+        assert "prints.cache" in dowel
+        assert "prints.constants" in led_ring
+        # the command line is only imported lazily, by ``prints.api``
+        assert "prints.operations" in led_ring
+        assert "prints.cli" not in led_ring
+
+    def test_versions(self):
+        module_digest.cache_clear()
+        self.addCleanup(module_digest.cache_clear)
+        digest = module_digest("prints.models.ring")
+
+        module_digest.cache_clear()
+        with mock.patch("prints.cache.version", return_value="0.0.0"):
+            assert module_digest("prints.models.ring") != digest
+
+
+class TestEvict(TestCase):
+    def test_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as directory:
+            now = time.time()
+            for idx, name in enumerate(("old", "mid", "new")):
+                path = os.path.join(directory, name)
+                with open(path, "wb") as f:
+                    f.write(b"x" * 10)
+                os.utime(path, (now + idx, now + idx))
+
+            evict([directory], 20)
+
+            assert sorted(os.listdir(directory)) == ["mid", "new"]
+
+    def test_shared_budget(self):
+        with tempfile.TemporaryDirectory() as directory:
+            now = time.time()
+            for idx, name in enumerate(("shapes", "artifacts", "deps")):
+                os.mkdir(os.path.join(directory, name))
+                path = os.path.join(directory, name, "entry")
+                with open(path, "wb") as f:
+                    f.write(b"x" * 10)
+                os.utime(path, (now + idx, now + idx))
+            # a write in progress is neither counted nor removed
+            with open(os.path.join(directory, "shapes", "write.tmp"), "wb") as f:
+                f.write(b"x" * 100)
+
+            with mock.patch.dict(os.environ, {CACHE_DIR_ENV: directory}):
+                evict_cache(20)
+
+            assert os.listdir(os.path.join(directory, "shapes")) == ["write.tmp"]
+            assert os.listdir(os.path.join(directory, "artifacts")) == ["entry"]
+            assert os.listdir(os.path.join(directory, "deps")) == ["entry"]
+
+
+class TestArtifactKey(TestCase):
+    def test_imports(self):
+        from prints.models import ring
+
+        key = artifact_key(ring, type="stl")
+        assert artifact_key(ring, type="3mf") != key
+
+        # a change to the model's imports, or to the export code
+        for changed in ("prints.models.ring", "prints.cli"):
+            with mock.patch(
+                "prints.cache.module_digest",
+                side_effect=lambda name, changed=changed: (
+                    "changed" if name == changed else module_digest(name)
+                ),
+            ):
+                assert artifact_key(ring, type="stl") != key
@@ -1,8 +1,34 @@
-from unittest import TestCase
+import io
+import os
+import tempfile
+import zipfile
+from argparse import Namespace
+from collections.abc import Iterator
+from contextlib import redirect_stderr
+from typing import Any
+from unittest import TestCase, mock
 
 import pytest
-from prints.cli import create_param_parser, serialize_params, validate_mod_name
-from prints.params import ParamsBase
+from build123d import Box, Mesher, Part, Pos, Sphere
+from OCP.BRep import BRep_Tool
+from OCP.TopLoc import TopLoc_Location
+from prints.cache import CACHE_DIR_ENV
+from prints.cli import (
+    EXPORT_TYPES,
+    STEP_TIMESTAMP,
+    create_param_parser,
+    export,
+    iter_results,
+    load_module,
+    parse_copies,
+    parse_params,
+    serialize_params,
+    thumbnails,
+    validate_mod_name,
+)
+from prints.params import ParamsBase, Result
+from prints.thumbnail import PNG_SIGNATURE
+from prints_test.test_gltf import read_glb
 
 
 class TestParamParser(TestCase):
@@ -168,3 +194,404 @@ class TestValidateModName(TestCase):
 
         with pytest.raises(ValueError, match="invalid module name; invalid import"):
             validate_mod_name("some.cool-module")
+
+
+class BoxParams(ParamsBase):
+    size: float = 10
+
+
+class box_mod:
+    Params = BoxParams
+
+    @staticmethod
+    def main(params: BoxParams) -> Result:
+        part = Part() + Box(params.size, params.size, params.size)
+        return Result(part=part, locals=None)
+
+
+class face_mod:
+    Params = BoxParams
+
+    @staticmethod
+    def main(params: BoxParams) -> Result:
+        # a single face, which has edges of its own and no volume
+        face = Box(params.size, params.size, params.size).faces()[0]
+        return Result(part=face, locals=None)
+
+
+class sphere_mod:
+    Params = BoxParams
+
+    @staticmethod
+    def main(params: BoxParams) -> Result:
+        # curved faces, meshed separately, meeting along an edge, and poles
+        sphere = Sphere(params.size / 2)
+        part = Part() + sphere - Pos(0, 0, -params.size / 2) * Box(*(params.size,) * 3)
+        return Result(part=part, locals=None)
+
+
+class kept_mod:
+    Params = BoxParams
+    parts: list[Part] = []
+
+    @staticmethod
+    def main(params: BoxParams) -> Result:
+        part = Part() + Box(params.size, params.size, params.size)
+        kept_mod.parts.append(part)
+        return Result(part=part, locals=None)
+
+
+class parts_mod:
+    Params = BoxParams
+    built: list[str] = []
+
+    @staticmethod
+    def main(params: BoxParams) -> Iterator[Result]:
+        for name in ("a", "b", "c"):
+            parts_mod.built.append(name)
+            part = Part() + Box(params.size, params.size, params.size)
+            yield Result(part=part, locals={"name": name}, name=name)
+
+
+class TestExport(TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+
+    def _export(
+        self,
+        params: BoxParams,
+        *,
+        force: bool = False,
+        type: str = "stl",
+        copies: list[str] | None = None,
+        preset: str | None = None,
+        thumbnail: bool = False,
+        check: str = "off",
+        mod: Any = box_mod,
+    ) -> str:
+        args = Namespace(
+            out=self._dir.name,
+            mkdirp=False,
+            force=force,
+            only=None,
+            type=type,
+            copies=copies,
+            step_timestamp=False,
+            preset=preset,
+            params_file=None,
+            thumbnail=thumbnail,
+            check=check,
+        )
+        export("box", mod, args=args, params=params)
+        return os.path.join(self._dir.name, f"box.{type}")
+
+    def test_export(self):
+        path = self._export(BoxParams())
+
+        assert os.path.exists(path)
+        assert os.listdir(self._dir.name) == ["box.stl"]
+
+    def test_unchanged(self):
+        path = self._export(BoxParams())
+        os.utime(path, (0, 0))
+
+        self._export(BoxParams())
+
+        assert os.stat(path).st_mtime == 0
+        assert os.listdir(self._dir.name) == ["box.stl"]
+
+    def test_changed_requires_force(self):
+        path = self._export(BoxParams())
+        os.utime(path, (0, 0))
+        params = BoxParams()
+        params.size = 20
+
+        with pytest.raises(FileExistsError, match="use --force to overwrite"):
+            self._export(params)
+        assert os.stat(path).st_mtime == 0
+
+        self._export(params, force=True)
+        assert os.stat(path).st_mtime != 0
+        assert os.listdir(self._dir.name) == ["box.stl"]
+
+    def test_copies(self):
+        path = self._export(BoxParams(), type="3mf", copies=["3"])
+
+        mesher = Mesher()
+        mesher.read(path)
+        items = mesher.model.GetBuildItems()
+        count = 0
+        while items.MoveNext():
+            count += 1
+
+        assert len(mesher.meshes) == 1
+        assert count == 3
+
+    def test_copies_unsupported_type(self):
+        with pytest.raises(ValueError, match="only supported when exporting 3mf"):
+            self._export(BoxParams(), copies=["3"])
+
+    def test_thumbnail(self):
+        path = self._export(BoxParams(), type="3mf", thumbnail=True)
+
+        with zipfile.ZipFile(path) as archive:
+            png = archive.read("Metadata/thumbnail.png")
+        assert png.startswith(PNG_SIGNATURE)
+
+    def test_check(self):
+        self._export(BoxParams(), check="error")
+
+        with pytest.raises(ValueError, match="not shared by exactly two"):
+            self._export(BoxParams(), check="error", mod=face_mod)
+        assert os.listdir(self._dir.name) == ["box.stl"]
+
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            path = self._export(BoxParams(), check="warn", mod=face_mod, force=True)
+        assert "warning: box: 4 edges not shared" in stderr.getvalue()
+        assert os.path.exists(path)
+
+    def test_check_valid(self):
+        # the meshes written are checked, so valid parts aren't flagged
+        for type in EXPORT_TYPES:
+            self._export(BoxParams(), type=type, check="error", mod=sphere_mod)
+
+    def test_parts_untouched(self):
+        # parts are meshed in another process, so the shapes here, which later
+        # parts may share, are never cleaned or meshed while they're built
+        for type in ("stl", "3mf", "glb"):
+            kept_mod.parts.clear()
+            self._export(BoxParams(), type=type, mod=kept_mod)
+
+            [part] = kept_mod.parts
+            for face in part.faces():
+                location = TopLoc_Location()
+                assert BRep_Tool.Triangulation_s(face.wrapped, location) is None
+
+    def test_deterministic(self):
+        for type in ("3mf", "step", "stl"):
+            path = self._export(BoxParams(), type=type)
+            with open(path, "rb") as f:
+                first = f.read()
+            os.remove(path)
+
+            self._export(BoxParams(), type=type)
+            with open(path, "rb") as f:
+                assert f.read() == first, type
+
+    def test_step_timestamp(self):
+        path = self._export(BoxParams(), type="step")
+
+        with open(path) as f:
+            assert f"'{STEP_TIMESTAMP}'" in f.read()
+
+    def test_preset_cached(self):
+        cache = tempfile.TemporaryDirectory()
+        self.addCleanup(cache.cleanup)
+        self.enterContext(mock.patch.dict(os.environ, {CACHE_DIR_ENV: cache.name}))
+        main = self.enterContext(mock.patch.object(box_mod, "main", wraps=box_mod.main))
+
+        path = self._export(BoxParams(), preset="small")
+        with open(path, "rb") as f:
+            content = f.read()
+        os.remove(path)
+        self._export(BoxParams(), preset="small")
+
+        assert main.call_count == 1
+        with open(path, "rb") as f:
+            assert f.read() == content
+
+        # a change to the params is a new export
+        params = BoxParams()
+        params.size = 5
+        self._export(params, preset="small", force=True)
+        assert main.call_count == 2
+
+        # checks run on the meshes as they're written, so they skip the cache
+        self._export(params, preset="small", force=True, check="warn")
+        assert main.call_count == 3
+
+    def test_generator(self):
+        parts_mod.built = []
+        args = Namespace(
+            out=self._dir.name,
+            mkdirp=False,
+            force=False,
+            only=["b"],
+            type="stl",
+            copies=None,
+            step_timestamp=False,
+            preset=None,
+            params_file=None,
+            thumbnail=False,
+            check="off",
+        )
+
+        outputs = export("parts", parts_mod, args=args, params=BoxParams())
+
+        assert outputs == [os.path.join(self._dir.name, "parts-b.stl")]
+        # generation stops once the named parts are written
+        assert parts_mod.built == ["a", "b"]
+
+    def test_glb(self):
+        args = Namespace(
+            out=self._dir.name,
+            mkdirp=False,
+            force=False,
+            only=["a", "c"],
+            type="glb",
+            copies=None,
+            step_timestamp=False,
+            preset=None,
+            params_file=None,
+            thumbnail=False,
+            check="off",
+        )
+
+        [path] = export("parts", parts_mod, args=args, params=BoxParams())
+
+        assert path == os.path.join(self._dir.name, "parts.glb")
+        gltf, meshes = read_glb(path)
+        assert list(meshes) == ["a", "c"]
+        assert gltf["nodes"][1]["extras"] == {"module": "parts", "params": {"size": 10}}
+
+    def test_errors_per_part(self):
+        args = Namespace(
+            out=self._dir.name,
+            mkdirp=False,
+            force=False,
+            only=None,
+            type="stl",
+            copies=None,
+            step_timestamp=False,
+            preset=None,
+            params_file=None,
+            thumbnail=False,
+            check="off",
+        )
+        for name in ("a", "c"):
+            with open(os.path.join(self._dir.name, f"parts-{name}.stl"), "w") as f:
+                f.write("solid\nendsolid\n")
+
+        stderr = io.StringIO()
+        with (
+            redirect_stderr(stderr),
+            pytest.raises(FileExistsError, match="parts-a.stl exists"),
+        ):
+            export("parts", parts_mod, args=args, params=BoxParams())
+
+        # the parts between failures are still written, and each failure reported
+        assert os.path.getsize(os.path.join(self._dir.name, "parts-b.stl")) > 84
+        assert "failed: " in stderr.getvalue()
+        assert "parts-a.stl" in stderr.getvalue()
+        assert "parts-c.stl" in stderr.getvalue()
+
+
+class TestThumbnails(TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+
+    def _thumbnails(self, mod, *, workers: int) -> list[str]:
+        args = Namespace(
+            out=self._dir.name,
+            mkdirp=False,
+            force=False,
+            only=["a", "b"],
+            size=32,
+            workers=workers,
+        )
+        return thumbnails(mod.__name__, mod, args=args, params=BoxParams())
+
+    def test_thumbnails(self):
+        for workers in (1, 2):
+            paths = self._thumbnails(parts_mod, workers=workers)
+
+            assert paths == [
+                os.path.join(self._dir.name, f"parts_mod-{name}.png")
+                for name in ("a", "b")
+            ]
+            with open(paths[0], "rb") as f:
+                assert f.read().startswith(PNG_SIGNATURE)
+            for path in paths:
+                os.remove(path)
+
+    def test_exists(self):
+        self._thumbnails(box_mod, workers=1)
+
+        with pytest.raises(FileExistsError):
+            self._thumbnails(box_mod, workers=1)
+
+
+class TestIterResults(TestCase):
+    def test_single(self):
+        result = Result(part=Part(), locals=None)
+
+        assert list(iter_results(result)) == [result]
+
+    def test_generator_closed(self):
+        closed = []
+
+        def results():
+            try:
+                yield Result(part=Part(), locals=None, name="a")
+                yield Result(part=Part(), locals=None, name="b")
+            finally:
+                closed.append(True)
+
+        for r in iter_results(results()):
+            break
+
+        assert closed == [True]
+
+    def test_invalid(self):
+        with pytest.raises(ValueError, match="empty list of results"):
+            list(iter_results(iter([])))
+
+        with pytest.raises(ValueError, match="not instance of ``Result``"):
+            list(iter_results([Part()]))
+
+        with pytest.raises(ValueError, match="unexpected type"):
+            list(iter_results(Part()))
+
+
+class TestParsePresets(TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.mod = load_module("telescoping_box")
+
+    def test_preset(self):
+        params, fname_suffix = parse_params(
+            self.mod, ["--interior_height", "30"], preset="small"
+        )
+
+        assert params.interior_width == 30
+        assert params.interior_height == 30
+        assert fname_suffix == "-small&interior_height=30"
+
+    def test_unknown_preset(self):
+        with pytest.raises(ValueError, match="unknown preset 'tiny'"):
+            parse_params(self.mod, [], preset="tiny")
+
+    def test_params_file(self):
+        path = os.path.join(self._dir.name, "narrow.toml")
+        with open(path, "w") as f:
+            f.write("interior_depth = 10\ntop_interior_fillet = true\n")
+
+        params, fname_suffix = parse_params(self.mod, [], params_file=path)
+
+        assert params.interior_depth == 10
+        assert params.top_interior_fillet
+        assert fname_suffix == "-narrow"
+
+
+class TestParseCopies(TestCase):
+    def test_parse(self):
+        assert parse_copies(["2", "ring=3"]) == {None: 2, "ring": 3}
+
+    def test_invalid(self):
+        for value in ("ring", "ring=0", "ring=x"):
+            with pytest.raises(ValueError, match="invalid --copies value"):
+                parse_copies([value])
@@ -0,0 +1,112 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+import pytest
+from build123d import Box, Part
+
+from prints.cache import CACHE_DIR_ENV
+from prints.deps import part_builder, trace_params, untrace_params
+from prints.params import ParamsBase, Result
+from prints.utils import flatten_params
+
+
+class SizeParams(ParamsBase):
+    width: float = 1
+    depth: float = 2
+
+
+class Params(ParamsBase):
+    height: float = 3
+    unused: bool = False
+    size: SizeParams = SizeParams()
+
+
+builds = []
+
+
+@part_builder
+def _build(params: Params, size: SizeParams) -> Result:
+    builds.append(params.height)
+    part = Part() + Box(size.width, size.depth, params.height)
+    return Result(name="box", part=part, locals=locals())
+
+
+class TestTraceParams(TestCase):
+    def test_isinstance(self):
+        traced = trace_params(Params())
+
+        assert isinstance(traced, Params)
+        assert isinstance(traced.size, SizeParams)
+
+    def test_reads_values(self):
+        params = Params()
+        params.size = SizeParams()
+        params.size.width = 5
+        traced = trace_params(params)
+
+        assert traced.height == 3
+        assert traced.size.width == 5
+
+    def test_flatten(self):
+        assert flatten_params(trace_params(Params())) == flatten_params(Params())
+
+
+class TestPartBuilder(TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.dict(os.environ, {CACHE_DIR_ENV: self._dir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._dir.cleanup)
+        builds.clear()
+
+    def test_records_reads(self):
+        params = trace_params(Params())
+        result = _build(params, params.size)
+
+        assert result.reads == {"height", "size.width", "size.depth"}
+
+    def test_untraced(self):
+        params = Params()
+        _build(params, params.size)
+        result = _build(params, params.size)
+
+        assert builds == [3, 3]
+        assert result.reads is None
+
+    def test_reuses_unchanged(self):
+        params = trace_params(Params())
+        _build(params, params.size)
+
+        params = Params()
+        params.unused = True
+        params = trace_params(params)
+        result = _build(params, params.size)
+
+        assert builds == [3]
+        assert result.name == "box"
+        assert result.locals is None
+        assert result.part.volume == pytest.approx(6)
+
+    def test_rebuilds_changed(self):
+        params = trace_params(Params())
+        _build(params, params.size)
+
+        params = Params()
+        params.height = 4
+        params = trace_params(params)
+        result = _build(params, params.size)
+
+        assert builds == [3, 4]
+        assert result.part.volume == pytest.approx(8)
+
+    def test_untraced_builds(self):
+        params = trace_params(Params())
+        _build(params, params.size)
+
+        params = untrace_params(params)
+        result = _build(params, params.size)
+
+        assert builds == [3, 3]
+        assert result.locals is not None
@@ -0,0 +1,33 @@
+import math
+from unittest import TestCase
+
+import pytest
+from build123d import Box, Part
+
+from prints.estimate import estimate, filament_length, mass, print_time
+
+
+class TestEstimate(TestCase):
+    def test_filament_length(self):
+        assert filament_length(math.pi, diameter=2) == pytest.approx(1)
+
+    def test_mass(self):
+        assert mass(1000, density=1.24) == pytest.approx(1.24)
+
+    def test_print_time(self):
+        assert print_time(80, 16, flow_rate=8, surface_rate=4) == pytest.approx(14)
+
+    def test_estimate(self):
+        part = Part() + Box(10, 10, 10)
+
+        result = estimate("box", part, density=1, time=True)
+
+        assert result.volume == pytest.approx(1000)
+        assert result.area == pytest.approx(600)
+        assert result.mass == pytest.approx(1)
+        assert result.time == pytest.approx(print_time(1000, 600))
+
+    def test_estimate_without_time(self):
+        result = estimate("box", Part() + Box(1, 1, 1))
+
+        assert result.time is None
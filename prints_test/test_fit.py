@@ -0,0 +1,92 @@
+import sys
+from unittest import TestCase, mock
+
+import numpy as np
+import pytest
+from build123d import Box, Cylinder, Pos
+
+from prints.fit import closest_points, fit, surface
+
+
+class TestClosestPoints(TestCase):
+    def test_regions(self):
+        triangle = np.array([[0, 0, 0], [2, 0, 0], [0, 2, 0]], dtype=np.float64)
+        points = np.array(
+            [
+                [0.5, 0.5, 1],  # face
+                [1, -1, 0],  # edge
+                [2, 2, 0],  # hypotenuse
+                [-1, -1, 0],  # vertex
+                [3, -1, 0],  # vertex
+            ],
+            dtype=np.float64,
+        )
+
+        result = closest_points(points, np.repeat(triangle[None], len(points), 0))
+
+        assert result == pytest.approx(
+            np.array([[0.5, 0.5, 0], [1, 0, 0], [1, 1, 0], [0, 0, 0], [2, 0, 0]])
+        )
+
+
+class TestSurface(TestCase):
+    def test_normals_outward(self):
+        s = surface(Box(10, 10, 10))
+
+        centers = s.triangles.mean(axis=1)
+        assert (np.einsum("ij,ij->i", centers, s.normals) > 0).all()
+
+    def test_samples_on_surface(self):
+        s = surface(Box(10, 10, 10), resolution=1)
+
+        assert len(s.samples) > 600
+        assert np.abs(s.samples).max(axis=1) == pytest.approx(5)
+
+
+class TestFit(TestCase):
+    def test_clearance(self):
+        result = fit(Box(10, 10, 10), Pos(10.3, 0, 0) * Box(10, 10, 10))
+
+        assert not result.interference
+        assert result.clearance == pytest.approx(0.3)
+        assert result.exact_clearance is None
+
+    def test_touching(self):
+        result = fit(Box(10, 10, 10), Pos(10, 0, 0) * Box(10, 10, 10))
+
+        assert not result.interference
+        assert result.clearance == pytest.approx(0, abs=1e-6)
+
+    def test_interference(self):
+        result = fit(Box(10, 10, 10), Pos(9.5, 0, 0) * Box(10, 10, 10), exact=True)
+
+        assert result.interference
+        assert result.clearance == pytest.approx(-0.5)
+        assert result.exact_clearance == pytest.approx(0)
+        assert result.interference_volume == pytest.approx(50)
+
+    def test_curved(self):
+        result = fit(Cylinder(5, 10), Pos(10.25, 0, 0) * Cylinder(5, 10), exact=True)
+
+        assert not result.interference
+        assert result.clearance == pytest.approx(0.25, abs=1e-3)
+        assert result.exact_clearance == pytest.approx(0.25)
+
+    def test_enclosing(self):
+        # a lid over a thin walled box, nearer its rim than its walls
+        box = Box(20, 20, 10) - Pos(0, 0, 0.5) * Box(19, 19, 9)
+        lid = Pos(0, 0, 5.25) * (Box(22, 22, 2) - Pos(0, 0, -0.5) * Box(20.4, 20.4, 1))
+
+        result = fit(box, lid, resolution=0.5)
+
+        assert not result.interference
+        assert result.clearance == pytest.approx(0.2)
+
+    def test_without_scipy(self):
+        with mock.patch.dict(sys.modules, {"scipy.spatial": None}):
+            result = fit(
+                Box(10, 10, 10), Pos(9.5, 0, 0) * Box(10, 10, 10), resolution=2
+            )
+
+        assert result.interference
+        assert result.clearance == pytest.approx(-0.5)
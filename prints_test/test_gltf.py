@@ -0,0 +1,105 @@
+import json
+import os
+import struct
+import tempfile
+from typing import Any
+from unittest import TestCase
+
+import numpy as np
+import pytest
+from build123d import Box, Part
+
+from prints.gltf import QUANTIZATION, quantize, write_glb
+from prints.mesh import _volume, shape_mesh
+
+
+def read_glb(path: str) -> tuple[dict[str, Any], dict[str, tuple[np.ndarray, ...]]]:
+    """
+    Read a GLB written by ``write_glb``, returning its JSON and each node's
+    dequantized vertices and triangles, by name.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, length = struct.unpack_from("<4sII", data)
+    assert (magic, version, length) == (b"glTF", 2, len(data))
+    json_length, json_type = struct.unpack_from("<I4s", data, 12)
+    assert json_type == b"JSON" and json_length % 4 == 0
+    gltf = json.loads(data[20 : 20 + json_length])
+    bin_length, bin_type = struct.unpack_from("<I4s", data, 20 + json_length)
+    assert bin_type == b"BIN\x00" and bin_length % 4 == 0
+    binary = data[28 + json_length :]
+
+    meshes = {}
+    for node in gltf["nodes"][1:]:
+        [primitive] = gltf["meshes"][node["mesh"]]["primitives"]
+        positions = gltf["accessors"][primitive["attributes"]["POSITION"]]
+        indices = gltf["accessors"][primitive["indices"]]
+        positions_view = gltf["bufferViews"][positions["bufferView"]]
+        indices_view = gltf["bufferViews"][indices["bufferView"]]
+        assert positions_view["byteOffset"] % 4 == 0
+        assert indices_view["byteOffset"] % 4 == 0
+
+        quantized = np.frombuffer(
+            binary, "<u2", positions["count"] * 4, positions_view["byteOffset"]
+        ).reshape(-1, 4)[:, :3]
+        dtype = "<u2" if indices["componentType"] == 5123 else "<u4"
+        triangles = np.frombuffer(
+            binary, dtype, indices["count"], indices_view["byteOffset"]
+        ).reshape(-1, 3)
+        vertices = quantized * np.array(node["scale"]) + node["translation"]
+        meshes[node["name"]] = (vertices, triangles.astype(np.int64))
+
+    return gltf, meshes
+
+
+class TestQuantize(TestCase):
+    def test_quantize(self):
+        vertices = np.array([[0, 0, 1], [10, 5, 1], [2.5, 5, 1]], dtype=np.float64)
+
+        quantized, translation, scale = quantize(vertices)
+
+        assert quantized.dtype == np.uint16
+        assert quantized[:, 0].tolist() == [0, 65535, 16384]
+        # a flat extent is left unscaled
+        assert quantized[:, 2].tolist() == [0, 0, 0]
+        assert quantized * np.array(scale) + translation == pytest.approx(
+            vertices, abs=1e-3
+        )
+
+
+class TestWriteGlb(TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.path = os.path.join(self._dir.name, "parts.glb")
+
+    def test_write(self):
+        box = shape_mesh(Part() + Box(10, 20, 30))
+
+        write_glb(self.path, [("a", box), ("b", box)], extras={"params": {"x": 1}})
+        gltf, meshes = read_glb(self.path)
+
+        assert gltf["extensionsRequired"] == [QUANTIZATION]
+        assert [n["name"] for n in gltf["nodes"]] == ["root", "a", "b"]
+        assert gltf["nodes"][1]["extras"] == {"params": {"x": 1}}
+        vertices, triangles = meshes["a"]
+        # welded, from the four corners of each face
+        assert len(vertices) == 8
+        assert _volume(vertices, triangles) == pytest.approx(6000)
+
+    def test_large_indices(self):
+        # more vertices than an unsigned short can index
+        vertices = np.random.default_rng(0).random((70000 * 3, 3))
+        triangles = np.arange(len(vertices)).reshape(-1, 3)
+
+        write_glb(self.path, [("a", (vertices, triangles))])
+        gltf, meshes = read_glb(self.path)
+
+        assert gltf["accessors"][1]["componentType"] == 5125
+        assert meshes["a"][0][meshes["a"][1][-1]] == pytest.approx(
+            vertices[-3:], abs=1e-4
+        )
+
+    def test_empty(self):
+        with pytest.raises(ValueError, match="no triangles"):
+            write_glb(self.path, [("a", (np.zeros((0, 3)), np.zeros((0, 3))))])
@@ -0,0 +1,238 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import pytest
+
+from prints.jobs import (
+    Job,
+    JobResult,
+    append_manifest,
+    fingerprint,
+    load_jobs,
+    preload_modules,
+    read_manifest,
+    run_jobs,
+)
+
+
+def _write_jobs(directory: str, content: str) -> str:
+    path = os.path.join(directory, "jobs.toml")
+    with open(path, "w") as f:
+        f.write(content)
+    return path
+
+
+class TestLoadJobs(TestCase):
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = _write_jobs(
+                directory,
+                """
+workers = 3
+
+[defaults]
+out = "out/"
+types = ["stl"]
+
+[[jobs]]
+module = "ring"
+
+[[jobs]]
+module = "led_ring"
+only = ["ring"]
+types = ["3mf", "step"]
+copies = { ring = 2 }
+params = { "ring.segments" = 4, driver = { width = 50 } }
+
+[[jobs]]
+module = "telescoping_box"
+preset = "small"
+""",
+            )
+            workers, jobs = load_jobs(path)
+
+        assert workers == 3
+        assert jobs == [
+            Job(module="ring", types=("stl",), out=os.path.join(directory, "out/")),
+            Job(
+                module="led_ring",
+                params={"ring.segments": 4, "driver.width": 50},
+                types=("3mf", "step"),
+                only=("ring",),
+                copies=("ring=2",),
+                out=os.path.join(directory, "out/"),
+            ),
+            Job(
+                module="telescoping_box",
+                preset="small",
+                types=("stl",),
+                out=os.path.join(directory, "out/"),
+            ),
+        ]
+
+    def test_unknown_keys(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = _write_jobs(directory, '[[jobs]]\nmodule = "ring"\nwat = 1\n')
+            with pytest.raises(ValueError, match="job 0: unknown keys wat"):
+                load_jobs(path)
+
+    def test_missing_module(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = _write_jobs(directory, '[[jobs]]\nout = "out/"\n')
+            with pytest.raises(ValueError, match="job 0: missing ``module``"):
+                load_jobs(path)
+
+    def test_unsupported_types(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = _write_jobs(
+                directory, '[[jobs]]\nmodule = "ring"\ntypes = ["obj"]\n'
+            )
+            with pytest.raises(ValueError, match="job 0: unsupported types obj"):
+                load_jobs(path)
+
+
+class TestJob(TestCase):
+    def test_raw_params(self):
+        job = Job(
+            module="led_ring",
+            params={"ring.segments": 4, "ring.width": 1.5, "a": True, "b": False},
+        )
+
+        assert job.raw_params() == [
+            "--ring_segments",
+            "4",
+            "--ring_width",
+            "1.5",
+            "--a",
+            "--no-b",
+        ]
+
+    def test_fingerprint_canonical(self):
+        explicit_default = Job(module="ring", params={"thickness": 2.7})
+        changed = Job(module="ring", params={"thickness": 3})
+
+        assert fingerprint(Job(module="ring")) == fingerprint(explicit_default)
+        assert fingerprint(Job(module="ring")) != fingerprint(changed)
+
+    def test_fingerprint_nested(self):
+        nested = fingerprint(Job(module="led_ring", params={"ring.segments": 4}))
+
+        # overriding a nested param leaves the shared defaults untouched
+        assert fingerprint(Job(module="led_ring")) != nested
+
+
+class TestRunJobs(TestCase):
+    def test_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            out = os.path.join(directory, "out/")
+            jobs = [
+                Job(module="ring", types=("stl",), out=out),
+                Job(module="ring", types=("stl",), out=out, params={"height": 2.5}),
+                Job(module="ring", types=("stl",), out=out, params={"thickness": 50}),
+            ]
+
+            results = run_jobs(jobs, workers=2)
+
+            assert len(results) == 2
+            assert results[0].error is None
+            assert results[0].outputs == [os.path.join(out, "ring.stl")]
+            assert os.path.exists(results[0].outputs[0])
+            assert results[1].error
+
+    def test_invalid(self):
+        with tempfile.TemporaryDirectory() as directory:
+            out = os.path.join(directory, "out/")
+            jobs = [
+                Job(module="telescoping_box", out=out, params={"thickness": 0}),
+                Job(module="ring", types=("stl",), out=out),
+            ]
+
+            results = run_jobs(jobs, workers=1)
+
+            assert results[0].error == "ValueError: thickness must be positive"
+            assert results[1].error is None
+            assert os.listdir(out) == ["ring.stl"]
+
+    def test_unknown_param(self):
+        with tempfile.TemporaryDirectory() as directory:
+            out = os.path.join(directory, "out/")
+            jobs = [
+                Job(module="ring", out=out, params={"wat": 1}),
+                Job(module="ring", types=("stl",), out=out),
+            ]
+
+            results = run_jobs(jobs, workers=1)
+
+            assert results[0].error == ("ValueError: unrecognized arguments: --wat 1")
+            assert results[1].error is None
+
+    def test_copies_mixed_types(self):
+        with tempfile.TemporaryDirectory() as directory:
+            out = os.path.join(directory, "out/")
+            jobs = [Job(module="ring", types=("3mf", "stl"), copies=("2",), out=out)]
+
+            [result] = run_jobs(jobs, workers=1)
+
+            assert result.error is None
+            assert sorted(os.listdir(out)) == ["ring.3mf", "ring.stl"]
+
+    def test_forkserver(self):
+        with tempfile.TemporaryDirectory() as directory:
+            out = os.path.join(directory, "out/")
+            jobs = [Job(module="ring", types=("stl",), out=out)]
+
+            results = run_jobs(jobs, workers=1, start_method="forkserver")
+
+            assert results[0].error is None
+            assert "prints.models.ring" in preload_modules()
+
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as directory:
+            out = os.path.join(directory, "out/")
+            manifest = os.path.join(directory, "jobs.manifest.jsonl")
+            jobs = [
+                Job(module="ring", types=("stl",), out=out),
+                Job(module="ring", types=("stl",), out=out, params={"thickness": 50}),
+            ]
+
+            first = run_jobs(jobs, workers=1, manifest=manifest)
+            # a record cut short by an interrupted run is ignored
+            with open(manifest, "a") as f:
+                f.write('{"fingerprint": "abc')
+            resumed = run_jobs(jobs, workers=1, manifest=manifest, resume=True)
+
+            assert list(read_manifest(manifest)) == [first[0].fingerprint]
+            assert resumed[0].resumed
+            assert resumed[0].outputs == first[0].outputs
+            assert not resumed[1].resumed
+            assert resumed[1].error
+
+    def test_append_after_partial_record(self):
+        with tempfile.TemporaryDirectory() as directory:
+            manifest = os.path.join(directory, "jobs.manifest.jsonl")
+            with open(manifest, "w") as f:
+                f.write('{"fingerprint": "abc')
+
+            append_manifest(
+                manifest, JobResult(job=Job(module="ring"), fingerprint="a")
+            )
+            append_manifest(
+                manifest, JobResult(job=Job(module="ring"), fingerprint="b")
+            )
+
+            assert list(read_manifest(manifest)) == ["a", "b"]
+
+    def test_resume_changed_outputs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            out = os.path.join(directory, "out/")
+            manifest = os.path.join(directory, "jobs.manifest.jsonl")
+            jobs = [Job(module="ring", types=("stl",), out=out, force=True)]
+
+            first = run_jobs(jobs, workers=1, manifest=manifest)
+            with open(first[0].outputs[0], "ab") as f:
+                f.write(b"edited")
+            resumed = run_jobs(jobs, workers=1, manifest=manifest, resume=True)
+
+            assert not resumed[0].resumed
+            assert resumed[0].error is None
@@ -0,0 +1,207 @@
+import os
+import tempfile
+from argparse import Namespace
+from unittest import TestCase
+
+import numpy as np
+import pytest
+from build123d import Box, Part, Pos, Sphere, export_stl
+
+from prints.cli import export
+from prints.mesh import (
+    STL_DTYPE,
+    WELD_TOLERANCE,
+    _volume,
+    check_mesh,
+    mesh_stats,
+    shape_mesh,
+    weld,
+)
+from prints.params import ParamsBase, Result
+
+
+class BoxParams(ParamsBase):
+    size: float = 10
+
+
+class box_mod:
+    Params = BoxParams
+
+    @staticmethod
+    def main(params: BoxParams) -> Result:
+        part = Part() + Box(params.size, params.size, params.size)
+        return Result(part=part, locals=None)
+
+
+class TestMeshStats(TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+
+    def test_stl(self):
+        path = os.path.join(self._dir.name, "box.stl")
+        export_stl(Part() + Box(10, 20, 30), path)
+
+        stats = mesh_stats(path)
+
+        assert stats.triangles == 12
+        assert stats.bbox == pytest.approx((-5, -10, -15, 5, 10, 15))
+        assert stats.volume == pytest.approx(6000)
+        assert stats.watertight
+        assert stats.metadata == {}
+
+    def test_ascii_stl(self):
+        path = os.path.join(self._dir.name, "box.stl")
+        export_stl(Part() + Box(10, 10, 10), path, ascii_format=True)
+
+        stats = mesh_stats(path)
+
+        assert stats.triangles == 12
+        assert stats.volume == pytest.approx(1000)
+
+    def test_open_stl(self):
+        path = os.path.join(self._dir.name, "box.stl")
+        export_stl(Part() + Box(10, 10, 10), path)
+        records = np.fromfile(path, dtype=STL_DTYPE, offset=84)
+        with open(path, "r+b") as f:
+            f.seek(80)
+            f.write(np.uint32(11).tobytes())
+            f.write(records[:11].tobytes())
+            f.truncate()
+
+        stats = mesh_stats(path)
+
+        assert stats.triangles == 11
+        assert not stats.watertight
+
+    def test_3mf(self):
+        args = Namespace(
+            out=self._dir.name,
+            mkdirp=False,
+            force=False,
+            only=None,
+            type="3mf",
+            copies=["2"],
+            step_timestamp=False,
+            preset=None,
+            params_file=None,
+            thumbnail=False,
+            check="off",
+        )
+        [path] = export("box", box_mod, args=args, params=BoxParams())
+
+        stats = mesh_stats(path)
+
+        assert stats.triangles == 24
+        assert stats.bbox == pytest.approx((-5, -5, -5, 20, 5, 5))
+        assert stats.volume == pytest.approx(2000)
+        assert stats.watertight
+        assert stats.metadata == {"size": "10"}
+
+
+class TestShapeMesh(TestCase):
+    def test_box(self):
+        vertices, triangles = Result(part=Part() + Box(10, 10, 10), locals=None).mesh()
+
+        assert vertices.dtype == np.float64
+        assert triangles.dtype == np.int32
+        # each face has its own four corners
+        assert vertices.shape == (24, 3)
+        assert triangles.shape == (12, 3)
+        assert _volume(vertices, triangles) == pytest.approx(1000)
+
+    def test_located_and_reversed(self):
+        # a moved shape's faces have locations, and a hollow one reversed faces
+        part = Pos(20, 0, 0) * (Box(10, 10, 10) - Box(5, 5, 5))
+
+        vertices, triangles = shape_mesh(part)
+
+        assert vertices.min(axis=0) == pytest.approx((15, -5, -5))
+        assert vertices.max(axis=0) == pytest.approx((25, 5, 5))
+        assert _volume(vertices, triangles) == pytest.approx(1000 - 125)
+
+    def test_tolerance(self):
+        coarse = shape_mesh(Sphere(10), tolerance=0.1)
+        fine = shape_mesh(Sphere(10), tolerance=0.01)
+
+        assert len(fine[1]) > len(coarse[1])
+        volume = Sphere(10).volume
+        assert abs(_volume(*fine) - volume) < abs(_volume(*coarse) - volume)
+
+
+class TestCheckMesh(TestCase):
+    def setUp(self) -> None:
+        self.vertices, self.triangles = shape_mesh(Part() + Box(10, 10, 10))
+
+    def test_valid(self):
+        assert check_mesh((self.vertices, self.triangles)) == []
+
+    def test_open(self):
+        problems = check_mesh((self.vertices, self.triangles[1:]))
+
+        assert problems == ["3 edges not shared by exactly two triangles"]
+
+    def test_flipped(self):
+        triangles = self.triangles.copy()
+        triangles[0] = triangles[0, [0, 2, 1]]
+
+        assert check_mesh((self.vertices, triangles)) == [
+            "3 edges between inconsistently wound triangles"
+        ]
+
+    def test_inverted(self):
+        problems = check_mesh((self.vertices, self.triangles[:, [0, 2, 1]]))
+
+        assert problems == ["volume of -1000.000 mm³ is not positive"]
+
+    def test_zero_area(self):
+        # a sliver along the first triangle's first edge
+        a, b = self.triangles[0, :2]
+        vertices = np.concatenate(
+            [self.vertices, [(self.vertices[a] + self.vertices[b]) / 2]]
+        )
+        sliver = [[a, len(self.vertices), b]]
+
+        problems = check_mesh((vertices, np.concatenate([self.triangles, sliver])))
+
+        assert problems[0] == "1 zero-area triangles"
+
+    def test_collapsed(self):
+        # as at the poles of a sphere; dropped, as 3mf exports and slicers do
+        collapsed = self.triangles[:1, [0, 0, 1]]
+
+        assert (
+            check_mesh((self.vertices, np.concatenate([self.triangles, collapsed])))
+            == []
+        )
+
+    def test_nearly_coincident(self):
+        # each triangle with its own corners, off by float noise
+        corners = self.vertices[self.triangles].reshape(-1, 3)
+        corners += np.random.default_rng(0).uniform(-1e-12, 1e-12, corners.shape)
+        triangles = np.arange(len(corners)).reshape(-1, 3)
+
+        assert check_mesh((corners, triangles)) == []
+
+    def test_straddling(self):
+        # corners a hair apart, on either side of where cells of the weld, or
+        # of a grid rounded to, would split them
+        tetrahedron = np.array([[0, 0, 0], [10, 0, 0], [0, 10, 0], [0, 0, 10]], float)
+        triangles = np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]])
+        for offset in (0, WELD_TOLERANCE / 2):
+            corners = tetrahedron[triangles].reshape(-1, 3) + offset
+            corners += np.where(np.arange(len(corners)) % 2, 2e-13, -2e-13)[:, None]
+            indices = np.arange(len(corners)).reshape(-1, 3)
+
+            assert check_mesh((corners, indices)) == []
+
+    def test_weld_tolerance(self):
+        points = np.array([[0, 0, 0], [5e-7, 0, 0], [1e-5, 0, 0]], dtype=np.float64)
+
+        welded, indices = weld(points.reshape(1, 3, 3), 1e-6)
+
+        assert len(welded) == 2
+        assert indices.tolist() == [[0, 0, 1]]
+
+    def test_empty(self):
+        assert check_mesh((np.zeros((0, 3)), np.zeros((0, 3)))) == ["no triangles"]
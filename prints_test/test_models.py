@@ -0,0 +1,103 @@
+"""
+Build every public model with its default params, and compare the geometry of
+each part to the golden values in ``models.json``.
+
+The models are built in parallel, as the module's first test starts. After an
+intentional change to a model, regenerate the golden values with::
+
+    python -m prints_test.test_models
+"""
+
+import json
+import os
+import pkgutil
+import time
+from concurrent.futures import Future
+from typing import Any
+
+import pytest
+
+from prints import models
+from prints.cache import CACHE_SIZE_ENV
+from prints.cli import iter_results, load_module, parse_params
+from prints.jobs import process_pool
+from prints.params import Result
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "models.json")
+# relative tolerance of volumes and areas; absolute tolerance of bounding boxes,
+# in mm
+REL_TOLERANCE = 1e-4
+ABS_TOLERANCE = 1e-3
+
+MODELS = sorted(
+    m.name for m in pkgutil.iter_modules(models.__path__) if not m.name.startswith("_")
+)
+
+
+def _fingerprint(result: Result) -> dict[str, Any]:
+    box = result.part.bounding_box()
+    return {
+        "volume": result.part.volume,
+        "area": result.part.area,
+        "bbox": [*box.min.to_tuple(), *box.max.to_tuple()],
+        "faces": len(result.part.faces()),
+    }
+
+
+def build(name: str) -> tuple[dict[str, dict[str, Any]], float]:
+    """
+    Build the model with its default params, returning the fingerprint of each
+    of its parts, by name, along with the time taken.
+    """
+    # build from scratch, rather than the cache
+    os.environ[CACHE_SIZE_ENV] = "0"
+
+    start = time.perf_counter()
+    mod = load_module(name)
+    params, _ = parse_params(mod, [])
+    parts = {
+        r.name or str(idx): _fingerprint(r)
+        for idx, r in enumerate(iter_results(mod.main(params)))
+    }
+    elapsed = time.perf_counter() - start
+
+    return parts, elapsed
+
+
+@pytest.fixture(scope="module")
+def builds():
+    with process_pool(start_method="forkserver") as pool:
+        futures: dict[str, Future] = {name: pool.submit(build, name) for name in MODELS}
+        yield futures
+
+
+@pytest.fixture(scope="module")
+def golden() -> dict[str, dict[str, dict[str, Any]]]:
+    with open(GOLDEN_PATH) as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("name", MODELS)
+def test_model(name, builds, golden, record_property):
+    parts, elapsed = builds[name].result()
+    record_property("build_seconds", elapsed)
+
+    assert name in golden, "no golden values; see this module's docstring"
+    assert parts.keys() == golden[name].keys()
+    for part, expected in golden[name].items():
+        actual = parts[part]
+        assert actual["faces"] == expected["faces"], part
+        assert actual["volume"] == pytest.approx(expected["volume"], REL_TOLERANCE)
+        assert actual["area"] == pytest.approx(expected["area"], REL_TOLERANCE)
+        assert actual["bbox"] == pytest.approx(expected["bbox"], abs=ABS_TOLERANCE)
+
+
+if __name__ == "__main__":
+    with process_pool(start_method="forkserver") as pool:
+        results = dict(zip(MODELS, pool.map(build, MODELS)))
+
+    with open(GOLDEN_PATH, "w") as f:
+        json.dump({name: parts for name, (parts, _) in results.items()}, f, indent=2)
+        f.write("\n")
+    for name, (_, elapsed) in results.items():
+        print(f"{name:<24}  {elapsed:7.2f}s")
@@ -0,0 +1,34 @@
+from math import pi
+from unittest import TestCase
+
+import pytest
+from build123d import Box, BuildPart, Cylinder, Mode, Pos
+
+from prints.operations import pattern_cut
+
+
+class TestPatternCut(TestCase):
+    def test_cut_part(self):
+        part = Box(10, 10, 10)
+        tools = [Pos(x, 0, 0) * Cylinder(radius=1, height=20) for x in (-3, 0, 3)]
+
+        result = pattern_cut(tools, part=part)
+
+        assert result.volume == pytest.approx(1000 - 3 * pi * 10)
+        assert part.volume == pytest.approx(1000)
+
+    def test_cut_builder(self):
+        with BuildPart() as part:
+            Box(10, 10, 10)
+            tools = [
+                Pos(x, 0, 0) * Cylinder(radius=1, height=20, mode=Mode.PRIVATE)
+                for x in (-3, 3)
+            ]
+            pattern_cut(tools, parallel=True)
+
+        assert part.part
+        assert part.part.volume == pytest.approx(1000 - 2 * pi * 10)
+
+    def test_cut_without_part(self):
+        with pytest.raises(RuntimeError, match="pattern_cut requires a part"):
+            pattern_cut(Cylinder(radius=1, height=20))
@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import pytest
+
 from prints.params import ParamsBase
 
 
@@ -32,3 +34,43 @@ class TestParamsBase(TestCase):
         }
 
         assert dict(Params()._annotations()) == expected
+
+    def test_validate_nested(self) -> None:
+        class SubParams(ParamsBase):
+            count: int = 1
+
+            def validate(self) -> None:
+                super().validate()
+                if self.count < 1:
+                    raise ValueError("count must be at least 1")
+
+        class Params(ParamsBase):
+            a: int = 1
+            sub: SubParams = SubParams()
+
+        params = Params()
+        params.validate()
+
+        params.sub = SubParams()
+        params.sub.count = 0
+        with pytest.raises(ValueError, match="count must be at least 1"):
+            params.validate()
+
+    def test_defaults_copies_nested(self) -> None:
+        class DoubleNested(ParamsBase):
+            d: int = 1
+
+        class Nested(ParamsBase):
+            c: int = 1
+            double: DoubleNested = DoubleNested()
+
+        class Params(ParamsBase):
+            nested: Nested = Nested()
+
+        params = Params.defaults()
+        params.nested.c = 2
+        params.nested.double.d = 2
+
+        assert Params().nested.c == 1
+        assert Params().nested.double.d == 1
+        assert Params.defaults().nested.double.d == 1
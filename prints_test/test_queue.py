@@ -0,0 +1,81 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase, mock
+
+import pytest
+
+from prints.jobs import Job
+from prints.queue import claim, enqueue, requeue_expired, run_worker, work
+
+
+class TestQueue(TestCase):
+    def test_enqueue_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            queue = os.path.join(directory, "queue")
+            job = Job(module="ring", types=("stl",), out=directory)
+
+            assert len(enqueue(queue, [job])) == 1
+            assert enqueue(queue, [job]) == []
+            assert os.listdir(os.path.join(queue, "pending")) != []
+
+    def test_claim(self):
+        with tempfile.TemporaryDirectory() as directory:
+            queue = os.path.join(directory, "queue")
+            job = Job(module="ring", types=("stl",), out=directory)
+            [job_fingerprint] = enqueue(queue, [job])
+
+            assert claim(queue) == (job_fingerprint, job)
+            assert claim(queue) is None
+
+    def test_requeue_expired(self):
+        with tempfile.TemporaryDirectory() as directory:
+            queue = os.path.join(directory, "queue")
+            job = Job(module="ring", types=("stl",), out=directory)
+            [job_fingerprint] = enqueue(queue, [job])
+            claim(queue)
+
+            # a claim within its lease is kept
+            assert requeue_expired(queue, lease=60) == []
+            claimed = os.path.join(queue, "claimed", f"{job_fingerprint}.json")
+            os.utime(claimed, (time.time() - 120, time.time() - 120))
+
+            assert claim(queue, lease=60) == (job_fingerprint, job)
+            assert os.listdir(os.path.join(queue, "pending")) == []
+
+    def test_interrupted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            queue = os.path.join(directory, "queue")
+            job = Job(module="ring", types=("stl",), out=directory)
+            [job_fingerprint] = enqueue(queue, [job])
+            claim(queue)
+
+            with mock.patch("prints.queue.run_job", side_effect=KeyboardInterrupt):
+                with pytest.raises(KeyboardInterrupt):
+                    work(queue, job_fingerprint, job)
+
+            assert os.listdir(os.path.join(queue, "claimed")) == []
+            assert claim(queue) == (job_fingerprint, job)
+
+    def test_workers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            queue = os.path.join(directory, "queue")
+            out = os.path.join(directory, "out/")
+            jobs = [
+                Job(module="ring", types=("stl",), out=out),
+                Job(module="ring", types=("stl",), out=out, params={"height": 3}),
+                Job(module="ring", types=("stl",), out=out, params={"thickness": 50}),
+            ]
+            enqueue(queue, jobs)
+
+            with ProcessPoolExecutor(max_workers=2) as pool:
+                futures = [pool.submit(run_worker, queue, once=True) for _ in range(2)]
+                results = [r for f in futures for r in f.result()]
+
+            assert len(results) == 3
+            assert len(os.listdir(os.path.join(queue, "done"))) == 2
+            assert len(os.listdir(os.path.join(queue, "failed"))) == 1
+            assert os.listdir(os.path.join(queue, "pending")) == []
+            assert os.listdir(os.path.join(queue, "claimed")) == []
+            assert len(os.listdir(os.path.join(queue, "logs"))) == 3
@@ -0,0 +1,49 @@
+import struct
+import zlib
+from unittest import TestCase
+
+import numpy as np
+from build123d import Box, Part
+
+from prints.mesh import shape_mesh
+from prints.thumbnail import PNG_SIGNATURE, encode_png, render
+
+
+class TestRender(TestCase):
+    def test_box(self):
+        image = render(shape_mesh(Part() + Box(10, 10, 10)), 64)
+
+        assert image.shape == (64, 64, 4)
+        # transparent at the corners, and opaque in the middle
+        assert image[0, 0, 3] == 0
+        assert image[32, 32, 3] == 255
+        # the three visible faces are shaded differently; others are blended,
+        # along the edges between them
+        opaque = image[image[..., 3] == 255][:, :3]
+        _, counts = np.unique(opaque, axis=0, return_counts=True)
+        assert np.sort(counts)[-3:].sum() > 0.9 * len(opaque)
+        assert np.sort(counts)[-3] > 0.2 * len(opaque)
+
+    def test_empty(self):
+        image = render((np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int32)), 16)
+
+        assert not image.any()
+
+
+class TestEncodePng(TestCase):
+    def test_encode(self):
+        image = np.arange(2 * 3 * 4, dtype=np.uint8).reshape(2, 3, 4)
+
+        png = encode_png(image)
+
+        assert png.startswith(PNG_SIGNATURE)
+        length, kind = struct.unpack_from(">I4s", png, 8)
+        assert kind == b"IHDR"
+        assert struct.unpack_from(">II", png, 16) == (3, 2)
+        offset = 8 + 12 + length
+        length, kind = struct.unpack_from(">I4s", png, offset)
+        assert kind == b"IDAT"
+        rows = zlib.decompress(png[offset + 8 : offset + 8 + length])
+        decoded = np.frombuffer(rows, np.uint8).reshape(2, -1)
+        assert (decoded[:, 0] == 0).all()
+        assert (decoded[:, 1:].reshape(image.shape) == image).all()
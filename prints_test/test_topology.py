@@ -0,0 +1,70 @@
+from unittest import TestCase
+
+import pytest
+from build123d import (
+    Axis,
+    Box,
+    BuildPart,
+    Cylinder,
+    GeomType,
+    Mode,
+    Plane,
+    fillet,
+)
+
+from prints.topology import topology
+
+
+def _same(a, b) -> bool:
+    return len(a) == len(b) and all(x.is_same(y) for x, y in zip(a, b))
+
+
+class TestTopology(TestCase):
+    def setUp(self) -> None:
+        with BuildPart() as part:
+            Box(10, 20, 30)
+            Cylinder(3, 30, mode=Mode.SUBTRACT)
+            fillet(part.edges().filter_by(Axis.Z)[0:2], radius=1)
+        assert part.part
+        self.part = part.part
+
+    def test_matches_shape_list(self):
+        index = topology(self.part)
+        queries = [
+            lambda s: s.faces().sort_by(Axis.Z),
+            lambda s: s.faces().sort_by(Axis.X, reverse=True),
+            lambda s: s.faces().filter_by(Axis.Y),
+            lambda s: s.faces().filter_by(Plane.XZ),
+            lambda s: s.faces().filter_by(GeomType.CYLINDER, reverse=True),
+            lambda s: s.edges().filter_by(Axis.Z),
+            lambda s: s.edges().filter_by(Plane.XY),
+            lambda s: s.vertices().sort_by(Axis.Z)[2:].sort_by(Axis.X),
+        ]
+
+        for query in queries:
+            assert _same(query(index), query(self.part))
+
+    def test_memoizes(self):
+        index = topology(self.part)
+
+        first = index.faces().sort_by(Axis.Z)
+        first.pop()
+        second = index.faces().sort_by(Axis.Z)
+
+        assert len(second) == len(self.part.faces())
+        assert [id(f) for f in first] == [id(f) for f in second[:-1]]
+
+    def test_builder_invalidates(self):
+        with BuildPart() as part:
+            Box(10, 10, 10)
+            index = topology()
+            assert topology(part) is index
+            assert len(index.faces()) == 6
+
+            Cylinder(2, 20, mode=Mode.SUBTRACT)
+            assert topology() is not index
+            assert len(topology().faces()) == 7
+
+    def test_no_builder(self):
+        with pytest.raises(RuntimeError, match="requires a shape, or an active"):
+            topology()